@@ -1,26 +1,127 @@
+import sys
+from array import array
+from contextlib import suppress
+from itertools import accumulate
 from pathlib import Path
 
+if __name__ == "__main__":
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from toolkit.inputs import BLOCK_SIZE
+from toolkit.inputs import Buffer
+from toolkit.inputs import count_byte
+from toolkit.inputs import count_symbols_in_blocks
+from toolkit.inputs import iter_chunks
+from toolkit.inputs import iter_text
+from toolkit.inputs import map_input
+from toolkit.inputs import walk_steps_in_blocks
+
+STEPS = bytes(1 if code == ord("(") else 255 if code == ord(")") else 0 for code in range(256))  # signed bytes
 
-def read_instructions(file_path: Path) -> str:
-    with file_path.open("r") as file:
-        return file.read().strip()
 
+def read_instructions(file_path: Path) -> Buffer:
+    return map_input(file_path)
 
-def get_destination_floor(route: str) -> int:
-    up = route.count("(")
-    down = len(route) - up
+
+def get_destination_floor(route: Buffer) -> int:
+    up = count_byte(route, b"(")
+    down = count_byte(route, b")")
     return up - down
 
 
-def find_instruction(instructions: str, *, floor: int) -> None | int:
+def find_instruction(instructions: Buffer, *, floor: int) -> None | int:
     current_floor = 0
-    for index, value in enumerate(instructions):
-        current_floor += 1 if value == "(" else -1
+    for index, value in enumerate(iter_text(instructions)):
+        if value == "(":
+            current_floor += 1
+        elif value == ")":
+            current_floor -= 1
+        else:
+            continue  # the trailing line break
+
         if current_floor == floor:
             return index + 1
     return None
 
 
+def get_destination_floor_in_blocks(path: Path, *, jobs: int | None = None) -> int:
+    return sum(up - down for up, down in count_symbols_in_blocks(path, b"()", jobs=jobs))
+
+
+def find_instruction_in_blocks(
+    path: Path, *, floor: int, block_size: int = BLOCK_SIZE, jobs: int | None = None
+) -> None | int:
+    """
+    Walk every block of a huge route in parallel first, keeping only its net change and the lowest
+    and highest floors it reaches relative to where it starts: a block starting at floor `f`
+    visits floors within `[f + lowest, f + highest]` only, and reaches both ends.
+    Then jump from block to block by the net changes and replay only the first block whose range holds the target.
+    """
+    route = map_input(path)
+    current_floor = 0
+    walks = walk_steps_in_blocks(path, STEPS, block_size=block_size, jobs=jobs)
+    for index, (change, lowest, highest) in enumerate(walks):
+        if current_floor + lowest <= floor <= current_floor + highest:
+            start = index * block_size
+            moves = memoryview(route[start : start + block_size].translate(STEPS)).cast("b")
+            floors = list(accumulate(moves, initial=current_floor))
+            with suppress(ValueError):
+                return start + _find_arrival(floors, moves, floor)
+        current_floor += change
+    return None
+
+
+def _find_arrival(floors: list[int], moves: memoryview, floor: int) -> int:
+    """The first move (1-based) of a replayed block ending on the floor; raises ValueError if there is none."""
+    position = floors.index(floor, 1)
+    while not moves[position - 1]:  # staying on the starting floor does not count as reaching it
+        position = floors.index(floor, position + 1)
+    return position
+
+
+class FloorIndex:
+    """
+    The first arrival at every floor of a route, recorded in one pass so that any number of questions
+    about the same route are answered by a lookup.
+    Moves change the floor by one, so the floors ever reached form the range `[lowest, highest]`,
+    and every new floor is first reached by extending that range; only the ground floor may be skipped.
+    """
+
+    def __init__(self, route: Buffer, block_size: int = BLOCK_SIZE) -> None:
+        above, below = array("q"), array("q")  # arrivals at floors 1, 2, ... and -1, -2, ...
+        ground, current_floor, offset = 0, 0, 0
+        for chunk in iter_chunks(route, block_size):
+            moves = memoryview(chunk.tobytes().translate(STEPS)).cast("b")
+            floors = list(accumulate(moves, initial=current_floor))
+            position = 1
+            for floor in range(len(above) + 1, max(floors) + 1):
+                position = floors.index(floor, position)
+                above.append(offset + position)
+            position = 1
+            for floor in range(-len(below) - 1, min(floors) - 1, -1):
+                position = floors.index(floor, position)
+                below.append(offset + position)
+            if not ground:
+                with suppress(ValueError):
+                    ground = offset + _find_arrival(floors, moves, 0)
+            current_floor, offset = floors[-1], offset + len(moves)
+
+        self.lowest, self.highest, self.destination = -len(below), len(above), current_floor
+        self.arrivals = array("q", reversed(below))
+        self.arrivals.append(ground)  # 0 when Santa never comes back to the ground floor
+        self.arrivals.extend(above)
+
+    def find_instruction(self, floor: int) -> None | int:
+        if self.lowest <= floor <= self.highest:
+            return self.arrivals[floor - self.lowest] or None
+        return None
+
+    def find_instructions(self, low: int, high: int) -> dict[int, int]:
+        """First arrivals at the floors of `[low, high]` that are ever reached."""
+        floors = range(max(low, self.lowest), min(high, self.highest) + 1)
+        return {floor: self.arrivals[floor - self.lowest] for floor in floors if self.arrivals[floor - self.lowest]}
+
+
 def main() -> None:
     instructions = read_instructions(Path("input.data"))
 
@@ -1,3 +1,11 @@
+import sys
+from pathlib import Path
+
+if __name__ == "__main__":
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from toolkit.telemetry import track_search
+
 INCREASING_SEQUENCES = set("".join(chr(ord("a") + i + j) for j in range(3)) for i in range(24))
 FORBIDDEN_CHARS = set("iol")
 
@@ -65,10 +73,15 @@ def increment_password(password: str) -> str:
 
 def update_password(password: str) -> str:
     """Find the next valid password."""
-    while True:
-        password = increment_password(password)
-        if is_valid_password(password):
-            return password
+    with track_search(f"update password {password}") as stats:
+        while True:
+            password = increment_password(password)
+            if stats is not None:
+                stats.test()
+            if is_valid_password(password):
+                if stats is not None:
+                    stats.found += 1
+                return password
 
 
 def main() -> None:
@@ -1,6 +1,16 @@
+import sys
 from itertools import permutations
 from pathlib import Path
 
+if __name__ == "__main__":
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from toolkit.search import Problem
+from toolkit.search import branch_and_bound
+from toolkit.telemetry import track_search
+
+type Seating = tuple[int, int, int, bool]  # (happiness so far, mask of seated attendees, last seated, circle closed)
+
 
 def parse_input(file_path: Path) -> dict[tuple[str, str], int]:
     """
@@ -32,34 +42,113 @@ def calculate_happiness(arrangement: tuple[str, ...], happiness_changes: dict[tu
     return total_happiness
 
 
+def find_best_permutation(attendees: set[str], happiness_changes: dict[tuple[str, str], int]) -> int:
+    """
+    Try every seating order of the attendees.
+    """
+    max_happiness = -1_000_000_000
+    with track_search(f"seat {len(attendees)} attendees") as stats:
+        for arrangement in permutations(attendees):
+            happiness = calculate_happiness(arrangement, happiness_changes)
+            if stats is not None:
+                stats.test()
+                stats.found += happiness > max_happiness
+            max_happiness = max(max_happiness, happiness)
+    return max_happiness
+
+
 def find_optimal_arrangement(happiness_changes: dict[tuple[str, str], int]) -> int:
     """
     Find the optimal seating arrangement for maximum happiness.
     """
     attendees = set(person for pair in happiness_changes.keys() for person in pair)
+    return find_best_permutation(attendees, happiness_changes)
+
+
+def find_optimal_arrangement_without_symmetries(happiness_changes: dict[tuple[str, str], int]) -> int:
+    """
+    Find the optimal seating arrangement, trying every circular seating only once:
+    the first attendee keeps the first seat and mirrored orders of the others are skipped.
+    """
+    attendees = sorted(set(person for pair in happiness_changes.keys() for person in pair))
+    if not attendees:
+        return 0  # an empty table is a single, joyless, arrangement
+
+    head, *others = attendees
     max_happiness = -1_000_000_000
-    for arrangement in permutations(attendees):
-        happiness = calculate_happiness(arrangement, happiness_changes)
+    for arrangement in permutations(others):
+        if len(arrangement) > 1 and arrangement[0] > arrangement[-1]:
+            continue  # the mirror image of a seating that is (or will be) tried
+        happiness = calculate_happiness((head, *arrangement), happiness_changes)
         max_happiness = max(max_happiness, happiness)
     return max_happiness
 
 
-def find_optimal_arrangement_with_me(happiness_changes: dict[tuple[str, str], int]) -> int:
+def find_optimal_arrangement_with_search(happiness_changes: dict[tuple[str, str], int]) -> int:
     """
-    Find the optimal seating arrangement for maximum happiness with me.
+    Seat attendees one by one next to the last seated, starting from a fixed head of the table,
+    and close the circle once everybody sits. Happiness is maximized as a minimization of its negation,
+    bounded by the best pair of neighbours filling every seat left.
+    """
+    attendees = sorted(set(person for pair in happiness_changes.keys() for person in pair))
+    if not attendees:
+        return 0
+
+    count = len(attendees)
+    pairs = [
+        [happiness_changes.get((a, b), 0) + happiness_changes.get((b, a), 0) for b in attendees] for a in attendees
+    ]
+    best_pair = max(max(row) for row in pairs)
+    everyone = (1 << count) - 1
+
+    def expand(seating: Seating) -> list[Seating]:
+        happiness, seated, last, _ = seating
+        if seated == everyone:
+            return [(happiness + pairs[last][0], seated, last, True)]
+        children = [
+            (happiness + pairs[last][nxt], seated | (1 << nxt), nxt, False)
+            for nxt in range(count)
+            if not seated & (1 << nxt)
+        ]
+        return sorted(children, reverse=True)  # the happiest neighbours first
+
+    def bound(seating: Seating) -> int:
+        happiness, seated, _, closed = seating
+        pairs_left = 0 if closed else count - seated.bit_count() + 1
+        return -(happiness + best_pair * pairs_left)
+
+    problem: Problem[Seating, int] = Problem(
+        start=(0, 1, 0, False),
+        expand=expand,
+        is_goal=lambda seating: seating[3],
+        cost=lambda seating: -seating[0],
+        bound=bound,
+        key=lambda seating: seating[1:],
+    )
+    best = branch_and_bound(problem, f"seat {count} attendees")
+    assert best is not None
+    return best[0]
+
+
+def seat_me(happiness_changes: dict[tuple[str, str], int]) -> dict[tuple[str, str], int]:
+    """
+    Add me to the attendees, indifferent to everybody as everybody is to me.
     """
     happiness_changes = happiness_changes.copy()
     attendees = set(person for pair in happiness_changes.keys() for person in pair)
     for attendee in attendees:
         happiness_changes[("me", attendee)] = 0
         happiness_changes[(attendee, "me")] = 0
-    attendees.add("me")
+    return happiness_changes
 
-    max_happiness = -1_000_000_000
-    for arrangement in permutations(attendees):
-        happiness = calculate_happiness(arrangement, happiness_changes)
-        max_happiness = max(max_happiness, happiness)
-    return max_happiness
+
+def find_optimal_arrangement_with_me(happiness_changes: dict[tuple[str, str], int]) -> int:
+    """
+    Find the optimal seating arrangement for maximum happiness with me.
+    """
+    happiness_changes = seat_me(happiness_changes)
+    attendees = set(person for pair in happiness_changes.keys() for person in pair)
+    return find_best_permutation(attendees, happiness_changes)
 
 
 def main() -> None:
@@ -1,5 +1,11 @@
+import sys
 from pathlib import Path
 
+if __name__ == "__main__":
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from toolkit.telemetry import track_search
+
 
 def parse_input(path: Path) -> tuple[list[tuple[str, str]], str]:
     with path.open("r", encoding="utf-8") as file:
@@ -32,16 +38,23 @@ def find_fewest_steps(replacements: list[tuple[str, str]], molecule: str) -> int
     reverse_replacements.sort(key=lambda x: -len(x[0]))  # sort by target length descending for greedy match
 
     steps = 0
-    while molecule != "e":
-        for target, source in reverse_replacements:
-            if target in molecule:
-                # replace the first occurrence of `target` with `source`
-                molecule = molecule.replace(target, source, 1)
-                steps += 1
-                break
-        else:
-            # if no replacement can be applied, it's an error
-            raise ValueError("Unable to reduce molecule to 'e'")
+    with track_search(f"reduce a molecule of {len(molecule)} characters") as stats:
+        while molecule != "e":
+            if stats is not None:
+                stats.expand()
+            for target, source in reverse_replacements:
+                if stats is not None:
+                    stats.test()
+                if target in molecule:
+                    # replace the first occurrence of `target` with `source`
+                    molecule = molecule.replace(target, source, 1)
+                    steps += 1
+                    break
+            else:
+                # if no replacement can be applied, it's an error
+                raise ValueError("Unable to reduce molecule to 'e'")
+        if stats is not None:
+            stats.found = 1
     return steps
 
 
@@ -1,7 +1,20 @@
+import sys
+from array import array
 from dataclasses import dataclass
+from operator import add
+from operator import mul
+from operator import sub
 from pathlib import Path
 from typing import Self
 
+if __name__ == "__main__":
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from toolkit.inputs import CHUNK_SIZE
+from toolkit.inputs import iter_line_chunks
+from toolkit.inputs import map_input
+from toolkit.inputs import map_line_spans
+
 
 @dataclass(frozen=True, kw_only=True)
 class Prism:
@@ -41,6 +54,36 @@ def calculate_ribbon_size(prism: Prism) -> int:
     return min_perimeter + prism.volume
 
 
+def measure_orders_in_span(path: Path, start: int, stop: int, chunk_size: int = CHUNK_SIZE) -> tuple[int, int]:
+    """
+    Paper and ribbon for the boxes of a span of lines, without a single per-box object:
+    every chunk is parsed into packed columns of lengths, widths and heights, which are then
+    combined column by column, so all the per-box arithmetic runs inside `map` and `sum`.
+    A chunk must hold exactly three sizes per line, or a malformed line would shift every later column.
+    """
+    paper = ribbon = 0
+    for chunk in iter_line_chunks(map_input(path), start, stop, chunk_size):
+        sizes = array("q", map(int, chunk.replace(b"x", b" ").split()))
+        lines = chunk.count(b"\n") + (not chunk.endswith(b"\n"))
+        if len(sizes) != 3 * lines:
+            raise ValueError(f"Expected 3 sizes for each of {lines} boxes, found {len(sizes)}")
+        lengths, widths, heights = sizes[0::3], sizes[1::3], sizes[2::3]
+        shortest = array("q", map(min, lengths, widths, heights))
+        longest = array("q", map(max, lengths, widths, heights))
+        middle = array("q", map(sub, map(sub, map(add, map(add, lengths, widths), heights), shortest), longest))
+
+        square = sum(map(mul, lengths, widths)) + sum(map(mul, widths, heights)) + sum(map(mul, heights, lengths))
+        paper += 2 * square + sum(map(mul, shortest, middle))
+        ribbon += 2 * (sum(shortest) + sum(middle)) + sum(map(mul, map(mul, lengths, widths), heights))
+    return paper, ribbon
+
+
+def measure_orders(path: Path, *, jobs: int | None = None) -> tuple[int, int]:
+    """Paper and ribbon for a whole order file in a single streaming pass, split across processes when it is big."""
+    totals = map_line_spans(path, measure_orders_in_span, jobs=jobs)
+    return sum(paper for paper, _ in totals), sum(ribbon for _, ribbon in totals)
+
+
 def main() -> None:
     prisms = load_prisms(Path("input.data"))
     # print(*prisms, sep="\n")
@@ -1,7 +1,18 @@
+import sys
 from dataclasses import dataclass
+from pathlib import Path
 from typing import List
 from typing import Optional
 
+if __name__ == "__main__":
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from toolkit.search import Problem
+from toolkit.search import best_first_search
+from toolkit.telemetry import track_search
+
+type Battle = tuple[int, int, int, int, tuple[int, ...]]  # (mana spent, hitpoints, mana, boss hitpoints, effect timers)
+
 
 @dataclass
 class Spell:
@@ -112,26 +123,102 @@ def find_least_mana_to_win(player: Player, boss: Player, spells: List[Spell], *,
         nonlocal min_mana
 
         if mana_spent >= min_mana:
+            if stats is not None:
+                stats.prune()
             return
 
+        if stats is not None:
+            stats.expand()
         for spell in spells:
             new_player = Player(player.hitpoints, player.mana, player.damage, player.armor)
             new_boss = Player(boss.hitpoints, boss.mana, boss.damage, boss.armor)
             new_effects = [Effect(effect.spell, effect.remaining_turns) for effect in effects]
 
+            if stats is not None:
+                stats.test()
             result = simulate_turn(new_player, new_boss, spell, new_effects, mana_spent, hard_mode)
 
             if result is not None:
                 if new_boss.hitpoints <= 0:
+                    if stats is not None:
+                        stats.found += result < min_mana
                     min_mana = min(min_mana, result)
                 else:
                     dfs(new_player, new_boss, new_effects, result)
 
-    dfs(player, boss, [], 0)
+    with track_search(f"fight the boss{' in hard mode' if hard_mode else ''}") as stats:
+        dfs(player, boss, [], 0)
 
     return min_mana
 
 
+def find_least_mana_with_search(player: Player, boss: Player, spells: List[Spell], *, hard_mode: bool) -> int:
+    """
+    Best-first search over compact battle states, cheapest first, with the same rules as `simulate_turn`.
+    The bound charges the boss hitpoints left after the running effects at the best mana per damage of any spell,
+    and battles reaching the same state at a higher price are dropped.
+    """
+    mana_per_damage = min(spell.cost / (spell.damage * max(1, spell.duration)) for spell in spells if spell.damage)
+
+    def apply_timers(boss_hitpoints: int, mana: int, timers: tuple[int, ...]) -> tuple[int, int, int, tuple[int, ...]]:
+        armor = 0
+        for spell, timer in zip(spells, timers, strict=True):
+            if timer:
+                armor = spell.armor or armor
+                boss_hitpoints -= spell.damage
+                mana += spell.mana
+        return armor, boss_hitpoints, mana, tuple(max(0, timer - 1) for timer in timers)
+
+    def take_turn(battle: Battle, index: int) -> Battle | None:
+        spent, hitpoints, mana, boss_hitpoints, timers = battle
+        if hard_mode:
+            hitpoints -= 1
+            if hitpoints <= 0:
+                return None
+
+        _, boss_hitpoints, mana, timers = apply_timers(boss_hitpoints, mana, timers)
+        if boss_hitpoints <= 0:
+            return spent, hitpoints, mana, boss_hitpoints, timers
+
+        spell = spells[index]
+        if spell.cost > mana or (spell.duration > 0 and timers[index]):
+            return None
+        mana -= spell.cost
+        spent += spell.cost
+        if spell.duration > 0:
+            timers = timers[:index] + (spell.duration,) + timers[index + 1 :]
+        else:
+            boss_hitpoints -= spell.damage
+            hitpoints += spell.healing
+        if boss_hitpoints <= 0:
+            return spent, hitpoints, mana, boss_hitpoints, timers
+
+        armor, boss_hitpoints, mana, timers = apply_timers(boss_hitpoints, mana, timers)
+        if boss_hitpoints <= 0:
+            return spent, hitpoints, mana, boss_hitpoints, timers
+
+        hitpoints -= max(1, boss.damage - armor)
+        if hitpoints <= 0:
+            return None
+        return spent, hitpoints, mana, boss_hitpoints, timers
+
+    def bound(battle: Battle) -> float:
+        spent, _, _, boss_hitpoints, timers = battle
+        pending_damage = sum(spell.damage * timer for spell, timer in zip(spells, timers, strict=True))
+        return spent + max(0, boss_hitpoints - pending_damage) * mana_per_damage
+
+    problem: Problem[Battle, float] = Problem(
+        start=(0, player.hitpoints, player.mana, boss.hitpoints, (0,) * len(spells)),
+        expand=lambda battle: filter(None, (take_turn(battle, index) for index in range(len(spells)))),
+        is_goal=lambda battle: battle[3] <= 0,
+        cost=lambda battle: battle[0],
+        bound=bound,
+        key=lambda battle: battle[1:],
+    )
+    best = best_first_search(problem, f"fight the boss{' in hard mode' if hard_mode else ''}")
+    return 1_000_000_000 if best is None else best[0]
+
+
 def main() -> None:
     spells = load_spells()
     player = Player(hitpoints=50, mana=500)
@@ -98,6 +98,40 @@ class Program:
         return 1
 
 
+def execute_decoded(instructions: list[Instruction], computer: Computer) -> None:
+    """Run a program decoded once into (opcode, register, offset) tuples instead of dispatching through methods."""
+    program: list[tuple[OpCode, str, int]] = []
+    for instruction in instructions:
+        match instruction.opcode:
+            case OpCode.JMP:
+                program.append((instruction.opcode, "", int(instruction.operand1.value)))
+            case OpCode.JIE | OpCode.JIO:
+                program.append((instruction.opcode, instruction.operand1.value, int(instruction.operand2.value)))
+            case _:
+                program.append((instruction.opcode, instruction.operand1.value, 1))
+
+    ip = 0
+    while 0 <= ip < len(program):
+        opcode, register, offset = program[ip]
+        match opcode:
+            case OpCode.HLF:
+                computer[register] //= 2
+            case OpCode.TPL:
+                computer[register] *= 3
+            case OpCode.INC:
+                computer[register] += 1
+            case OpCode.JMP:
+                ip += offset
+                continue
+            case OpCode.JIE if computer[register] % 2 == 0:
+                ip += offset
+                continue
+            case OpCode.JIO if computer[register] == 1:
+                ip += offset
+                continue
+        ip += 1
+
+
 def load_assembly(path: Path) -> list[Instruction]:
     with path.open("r", encoding="utf-8") as file:
         return [Instruction.from_str(line.strip()) for line in file]
@@ -1,7 +1,20 @@
+import sys
+from itertools import accumulate
 from itertools import combinations
+from math import ceil
+from math import comb
 from math import prod
 from pathlib import Path
 
+if __name__ == "__main__":
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from toolkit.search import Problem
+from toolkit.search import best_first_search
+from toolkit.telemetry import track_search
+
+type Bag = tuple[int, int, int, int]  # (packages, quantum entanglement, next package to consider, weight)
+
 
 def load_packages(path: Path) -> tuple[int, ...]:
     with path.open("r", encoding="utf-8") as file:
@@ -20,13 +33,20 @@ def distribute_packages(weights: tuple[int, ...], group_count: int) -> tuple[int
 
     target_weight_per_group = total_weight // group_count
 
-    for num_packages in range(1, (package_count // group_count) + 1):
-        distributions = [
-            combo for combo in combinations(weights, num_packages) if sum(combo) == target_weight_per_group
-        ]
-
-        if distributions:  # we've found a solution
-            return min(distributions, key=find_quantum_entanglement)
+    with track_search(f"distribute packages into {group_count} groups") as stats:
+        for num_packages in range(1, (package_count // group_count) + 1):
+            if stats is not None:
+                stats.expand()  # one level of bag sizes
+            distributions = [
+                combo for combo in combinations(weights, num_packages) if sum(combo) == target_weight_per_group
+            ]
+            if stats is not None:
+                stats.tested += comb(package_count, num_packages)
+                stats.found += len(distributions)
+                stats.tick()
+
+            if distributions:  # we've found a solution
+                return min(distributions, key=find_quantum_entanglement)
 
     return tuple()  # no valid combo found
 
@@ -36,6 +56,47 @@ def find_best_quantum_entanglement(packages: tuple[int, ...], *, group_count: in
     return find_quantum_entanglement(best_bag)
 
 
+def find_best_quantum_entanglement_with_search(packages: tuple[int, ...], *, group_count: int) -> int:
+    """
+    Best-first search over bags built from the heaviest package down, ordered by (packages, entanglement),
+    so the first bag of the target weight off the queue is the one `distribute_packages` would pick.
+    Bags that considered the same packages and weigh the same are transpositions of each other.
+    """
+    total_weight = sum(packages)
+    if total_weight % group_count != 0:
+        raise ValueError("Packages cannot be evenly divided into groups.")
+
+    target_weight = total_weight // group_count
+    weights = sorted(packages, reverse=True)
+    max_packages = len(weights) // group_count
+    weight_left = list(accumulate(reversed(weights), initial=0))[::-1]  # weight_left[i] = sum(weights[i:])
+
+    def expand(bag: Bag) -> list[Bag]:
+        count, entanglement, index, weight = bag
+        if index == len(weights):
+            return []
+        children = [(count, entanglement, index + 1, weight)]
+        if count < max_packages and weight + weights[index] <= target_weight:
+            children.append((count + 1, entanglement * weights[index], index + 1, weight + weights[index]))
+        return [child for child in children if weight_left[child[2]] >= target_weight - child[3]]
+
+    def bound(bag: Bag) -> tuple[int, int]:
+        count, entanglement, index, weight = bag
+        missing = target_weight - weight
+        return count + (ceil(missing / weights[index]) if missing else 0), entanglement
+
+    problem: Problem[Bag, tuple[int, int]] = Problem(
+        start=(0, 1, 0, 0),
+        expand=expand,
+        is_goal=lambda bag: bag[3] == target_weight and bag[0] > 0,
+        cost=lambda bag: bag[:2],
+        bound=bound,
+        key=lambda bag: bag[2:],
+    )
+    best = best_first_search(problem, f"distribute packages into {group_count} groups")
+    return 1 if best is None else best[1]
+
+
 def main() -> None:
     path = Path("input.data")
     packages = load_packages(path)
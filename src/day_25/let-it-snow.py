@@ -1,24 +1,32 @@
-def find_code(row: int, col: int) -> int:
-    """read more at https://en.wikipedia.org/wiki/Cantor's_diagonal_argument"""
+INITIAL_CODE = 20151125
+MULTIPLIER = 252533
+DIVISOR = 33554393
 
-    # starting values
-    initial_code = 20151125
-    multiplier = 252533
-    divisor = 33554393
 
-    # calculate the diagonal index for the given (row, col)
+def get_code_index(row: int, col: int) -> int:
+    """The 1-based position of a cell in the order the codes are written: diagonal by diagonal."""
     # diagonal filling formula: sum of numbers up to (row + col - 2) + col
     diagonal_number = row + col - 1
-    index = (diagonal_number * (diagonal_number - 1)) // 2 + col
+    return (diagonal_number * (diagonal_number - 1)) // 2 + col
+
+
+def find_code(row: int, col: int) -> int:
+    """read more at https://en.wikipedia.org/wiki/Cantor's_diagonal_argument"""
+    index = get_code_index(row, col)
 
     # generate codes up to the target index
-    code = initial_code
+    code = INITIAL_CODE
     for _ in range(1, index):  # start from 1 since the first code is already known
-        code = (code * multiplier) % divisor
+        code = (code * MULTIPLIER) % DIVISOR
 
     return code
 
 
+def jump_to_code(row: int, col: int) -> int:
+    """The same code in logarithmic time: the codes form a geometric sequence modulo `DIVISOR`."""
+    return INITIAL_CODE * pow(MULTIPLIER, get_code_index(row, col) - 1, DIVISOR) % DIVISOR
+
+
 def main() -> None:
     for cell in [(6, 6), (2981, 3075)]:
         print(f"code for {cell} is {find_code(*cell)}")
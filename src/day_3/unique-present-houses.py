@@ -1,19 +1,62 @@
+import sys
+from collections import deque
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from dataclasses import dataclass
+from itertools import accumulate
 from itertools import cycle
+from itertools import repeat
+from os import cpu_count
 from pathlib import Path
 
+if __name__ == "__main__":
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from toolkit.inputs import Buffer
+from toolkit.inputs import iter_text
+from toolkit.inputs import map_input
+from toolkit.registry import make_worker_pool
+
+MAX_GRID_CELLS = 1 << 27  # a byte per house of the bounding box; larger boxes are walked in bands of this many cells
+BOUNDS_BLOCK = 256
+CHUNK_MOVES = 1 << 16  # keeps the lists of cells walked per chunk small
+COLUMN_STEP = 1 << 32  # a house is packed into `x * COLUMN_STEP + y`, unique while a Santa makes under 2**31 moves
+PARALLEL_MOVES = 1 << 20  # shorter routes are walked in-process
+BATCHES_PER_WORKER = 4
+
+
+def _make_moves(*, north: int, south: int, east: int, west: int) -> tuple[int, ...]:
+    """A table from the bytes of a route to the steps they take, 0 for anything but an arrow."""
+    table = [0] * 256
+    for arrow, step in zip("^v><", [north, south, east, west], strict=True):
+        table[ord(arrow)] = step
+    return tuple(table)
+
+
+@dataclass(frozen=True, slots=True)
+class Coverage:
+    """Houses visited at least once by each of the Santas on their own, and by all of them together."""
+
+    per_santa: tuple[int, ...]
+    total: int
 
-def load_route(file_path: Path) -> str:
-    with file_path.open("r") as file:
-        return file.read().strip()
+    @property
+    def santa_count(self) -> int:
+        return len(self.per_santa)
 
 
-def get_unique_houses(route: str, santa_count: int = 1) -> set[tuple[int, int]]:
+def load_route(file_path: Path) -> Buffer:
+    return map_input(file_path)
+
+
+def get_unique_houses(route: Buffer, santa_count: int = 1) -> set[tuple[int, int]]:
     houses = {(0, 0)}
 
     tracker = [{"x": 0, "y": 0} for _ in range(santa_count)]
     santa_cycle = cycle(range(santa_count))
 
-    for direction in route:
+    for direction in iter_text(route):
         current_santa = tracker[next(santa_cycle)]
         match direction:
             case "^":  # north
@@ -24,11 +67,128 @@ def get_unique_houses(route: str, santa_count: int = 1) -> set[tuple[int, int]]:
                 current_santa["x"] += 1
             case "<":  # west
                 current_santa["x"] -= 1
+            case _:  # the trailing line break
+                continue
         houses.add((current_santa["x"], current_santa["y"]))
 
     return houses
 
 
+def _iter_turns(route: Buffer, santa_count: int, chunk_size: int) -> Iterator[tuple[int, bytes]]:
+    """The moves of every Santa chunk by chunk; chunks hold whole rounds of turns, so the strides stay aligned."""
+    size = max(santa_count, chunk_size - chunk_size % santa_count)
+    for start in range(0, len(route), size):
+        chunk = route[start : start + size]
+        for santa in range(santa_count):
+            yield santa, chunk[santa::santa_count]
+
+
+def _find_bounds(route: Buffer, santa_count: int, chunk_size: int) -> tuple[range, range]:
+    """
+    Columns and rows of a box holding every house that any of the Santas visits, from the arrows counted per block:
+    a block of moves starting at column `x` never leaves `[x - west, x + east]`, and likewise for the rows.
+    The box is a little larger than the tightest one, but counting is much cheaper than walking.
+    """
+    columns, rows = [0] * santa_count, [0] * santa_count
+    left = right = bottom = top = 0
+    for santa, moves in _iter_turns(route, santa_count, chunk_size):
+        x, y = columns[santa], rows[santa]
+        for start in range(0, len(moves), BOUNDS_BLOCK):
+            block = moves[start : start + BOUNDS_BLOCK]
+            north, south, east, west = map(block.count, b"^v><")
+            left, right = min(left, x - west), max(right, x + east)
+            bottom, top = min(bottom, y - south), max(top, y + north)
+            x, y = x + east - west, y + north - south
+        columns[santa], rows[santa] = x, y
+    return range(left, right + 1), range(bottom, top + 1)
+
+
+def count_unique_houses(route: Buffer, santa_count: int = 1, chunk_size: int = CHUNK_MOVES) -> int:
+    """
+    Houses visited at least once, without a single coordinate pair: a first pass bounds the visited area,
+    then every house is packed into its cell number `column * height + row`, so a move is a fixed step
+    through the cells and the walk of each Santa's strided moves is a single `accumulate`.
+    The cells are marked in a byte per house, one band of at most `MAX_GRID_CELLS` cells at a time,
+    so a box larger than that costs another walk of the route per band rather than more memory.
+    """
+    columns, rows = _find_bounds(route, santa_count, chunk_size)
+    steps = _make_moves(north=1, south=-1, east=len(rows), west=-len(rows))
+    origin = columns.index(0) * len(rows) + rows.index(0)
+    area = len(columns) * len(rows)
+
+    houses = 0
+    for band_start in range(0, area, MAX_GRID_CELLS):
+        band = range(min(MAX_GRID_CELLS, area - band_start))
+        grid = bytearray(len(band))
+        cells = [origin - band_start] * santa_count
+        if cells[0] in band:
+            grid[cells[0]] = 1
+        for santa, moves in _iter_turns(route, santa_count, chunk_size):
+            path = list(accumulate(map(steps.__getitem__, moves), initial=cells[santa]))
+            inside = filter(band.__contains__, path)
+            deque(map(grid.__setitem__, inside, repeat(1)), maxlen=0)  # a scatter run by `map`, not by the interpreter
+            cells[santa] = path[-1]
+        houses += grid.count(1)
+    return houses
+
+
+STRIDE_STEPS = _make_moves(north=1, south=-1, east=COLUMN_STEP, west=-COLUMN_STEP)
+
+
+def visit_strides(strides: list[bytes]) -> tuple[list[int], set[int]]:
+    """
+    Houses visited by each Santa of a batch walking their own strided moves, and the cells visited by the whole batch.
+    """
+    counts, cells = [], set()
+    for moves in strides:
+        visited = set(accumulate(map(STRIDE_STEPS.__getitem__, moves), initial=0))
+        counts.append(len(visited))
+        cells.update(visited)
+    return counts, cells
+
+
+type BatchMapper = Callable[..., Iterable[tuple[list[int], set[int]]]]
+
+
+def _cover(route: Buffer, santa_count: int, batch_count: int, map_batches: BatchMapper) -> Coverage:
+    """
+    Santa `k` only ever takes the moves `route[k::santa_count]`, so every Santa is walked on their own,
+    contiguous batches of Santas go through `map_batches`, and the visited cells are merged with set unions.
+    """
+    strides = [route[santa::santa_count] for santa in range(santa_count)]
+    size = -(-santa_count // min(batch_count, santa_count))
+    batches = [strides[start : start + size] for start in range(0, santa_count, size)]
+
+    per_santa: list[int] = []
+    houses: set[int] = set()
+    for counts, cells in map_batches(visit_strides, batches):
+        per_santa.extend(counts)
+        houses |= cells
+    return Coverage(tuple(per_santa), len(houses))
+
+
+def get_coverage(route: Buffer, santa_count: int = 1, *, jobs: int | None = None) -> Coverage:
+    """Strided coverage of a route; routes over `PARALLEL_MOVES` moves spread the Santas over worker processes."""
+    workers = jobs or cpu_count() or 1
+    if len(route) < PARALLEL_MOVES or workers == 1 or santa_count == 1:
+        return _cover(route, santa_count, 1, map)
+    with make_worker_pool(workers, visit_strides) as executor:
+        return _cover(route, santa_count, workers * BATCHES_PER_WORKER, executor.map)
+
+
+def sweep_coverage(route: Buffer, santa_counts: Iterable[int], *, jobs: int | None = None) -> Iterator[Coverage]:
+    """Coverage of a route for each of many Santa counts; long routes share one pool of workers between all of them."""
+    workers = jobs or cpu_count() or 1
+    if len(route) < PARALLEL_MOVES or workers == 1:
+        for santa_count in santa_counts:
+            yield _cover(route, santa_count, 1, map)
+        return
+
+    with make_worker_pool(workers, visit_strides) as executor:
+        for santa_count in santa_counts:
+            yield _cover(route, santa_count, workers * BATCHES_PER_WORKER, executor.map)
+
+
 def main() -> None:
     route = load_route(Path("input.data"))
 
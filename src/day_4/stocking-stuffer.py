@@ -1,26 +1,161 @@
+import sys
+from collections import deque
+from collections.abc import Collection
+from concurrent.futures import Future
 from hashlib import md5
+from itertools import count
+from os import cpu_count
+from pathlib import Path
+
+if __name__ == "__main__":
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from toolkit.registry import make_worker_pool
+from toolkit.telemetry import TICK_EVERY
+from toolkit.telemetry import track_search
+
+NONCES_PER_RANGE = 1 << 16  # small enough that a worker notices a cancellation within a fraction of a second
+RANGES_IN_FLIGHT_PER_WORKER = 2
+LAST_DIGITS = [str(digit).encode() for digit in range(10)]
 
 
 def mine_coins(secret_key: str, *, zeroes: int = 5) -> int:
     prefix = "0" * zeroes  # Create a string of the required number of leading zeroes
     number = 0
 
-    while True:
-        to_hash = f"{secret_key}{number}"
-        hash_result = md5(to_hash.encode()).hexdigest()
-        if hash_result.startswith(prefix):
-            return number
-        number += 1
+    with track_search(f"mine coins with {zeroes} zeroes") as stats:
+        while True:
+            to_hash = f"{secret_key}{number}"
+            hash_result = md5(to_hash.encode()).hexdigest()
+            if hash_result.startswith(prefix):
+                if stats is not None:
+                    stats.tested, stats.found = number + 1, 1
+                return number
+            number += 1
+
+            # the nonce is the count of tested candidates, so the counters are only synced once in a while
+            if stats is not None and not number % TICK_EVERY:
+                stats.tested = number
+                stats.tick()
+
+
+def _increment(digits: bytearray) -> None:
+    """Add one to a decimal number kept as ASCII digits, in place; an empty buffer stands for zero."""
+    position = len(digits) - 1
+    while position >= 0 and digits[position] == ord("9"):
+        digits[position] = ord("0")
+        position -= 1
+    if position < 0:
+        digits.insert(0, ord("1"))
+    else:
+        digits[position] += 1
+
+
+def _count_zero_nibbles(digest: bytes) -> int:
+    return len(digest) * 2 - len(digest.hex().lstrip("0"))
+
+
+def mine_span(secret_key: str, start: int, stop: int, zeroes: Collection[int]) -> dict[int, int]:
+    """
+    The lowest nonce of `[start, stop)` for each of the difficulties that has one.
+    The secret key is hashed once, and so is every run of ten nonces sharing all the digits but the last:
+    each nonce only `copy()`s that state and feeds it a single digit.
+    The leading digits live in a buffer that is incremented in place, and the zeroes are checked
+    on the raw `digest()` against the lowest difficulty still unanswered.
+    """
+    found: dict[int, int] = {}
+    wanted = sorted(set(zeroes))
+    full_bytes, odd = divmod(wanted[0], 2) if wanted else (0, 0)
+    prefix = bytes(full_bytes)
+    key_hasher = md5(secret_key.encode())
+    head = bytearray(str(start // 10).encode() if start >= 10 else b"")
+    nonce = start - start % 10
+
+    while nonce < stop and wanted:
+        head_hasher = key_hasher.copy()
+        head_hasher.update(head)
+        low, high = max(start - nonce, 0), min(stop - nonce, 10)
+        for digit, last_digit in zip(range(low, high), LAST_DIGITS[low:high], strict=True):
+            hasher = head_hasher.copy()
+            hasher.update(last_digit)
+            digest = hasher.digest()
+            if digest.startswith(prefix) and not (odd and digest[full_bytes] >> 4):
+                zero_nibbles = _count_zero_nibbles(digest)
+                found.update((difficulty, nonce + digit) for difficulty in wanted if difficulty <= zero_nibbles)
+                wanted = [difficulty for difficulty in wanted if difficulty > zero_nibbles]
+                if not wanted:
+                    break
+                full_bytes, odd = divmod(wanted[0], 2)
+                prefix = bytes(full_bytes)
+        nonce += 10
+        _increment(head)
+    return found
+
+
+def mine_range(secret_key: str, start: int, stop: int, zeroes: int) -> None | int:
+    """The lowest qualifying nonce of `[start, stop)`, if any."""
+    return mine_span(secret_key, start, stop, (zeroes,)).get(zeroes)
+
+
+def mine_all_coins(secret_key: str, zeroes: Collection[int] = (5, 6), *, start: int = 0) -> dict[int, int]:
+    """
+    The lowest nonce from `start` on of every difficulty, found in one sweep instead of restarting for each of them.
+    A nonce with more zeroes also has fewer, so a harder search may resume from the answer of an easier one.
+    """
+    wanted = set(zeroes)
+    found: dict[int, int] = {}
+    with track_search(f"mine coins with {', '.join(map(str, sorted(wanted)))} zeroes") as stats:
+        while wanted - found.keys():
+            found.update(mine_span(secret_key, start, start + NONCES_PER_RANGE, wanted - found.keys()))
+            start += NONCES_PER_RANGE
+            # the counters are synced once per range, so `tested` may overshoot the last answer by a range
+            if stats is not None:
+                stats.tested, stats.found = start, len(found)  # nonces below a resumed `start` count as tested
+                stats.tick()
+    return found
+
+
+def mine_coins_in_parallel(
+    secret_key: str, *, zeroes: int = 5, jobs: int | None = None, range_size: int = NONCES_PER_RANGE
+) -> int:
+    """
+    Hand out contiguous nonce ranges to worker processes, a few ranges per worker ahead, and collect them in order:
+    a range is only looked at once all the lower ones came back empty, so its hit is the lowest one,
+    whatever order the workers finish in. The ranges still queued are then cancelled.
+    """
+    workers = jobs or cpu_count() or 1
+    starts = count(0, range_size)
+
+    with track_search(f"mine coins with {zeroes} zeroes on {workers} workers") as stats:
+        number: None | int = None
+        if workers == 1:
+            while number is None:
+                start = next(starts)
+                number = mine_range(secret_key, start, start + range_size, zeroes)
+        else:
+            with make_worker_pool(workers, mine_range) as executor:
+
+                def submit(start: int) -> Future[None | int]:
+                    return executor.submit(mine_range, secret_key, start, start + range_size, zeroes)
+
+                pending = deque(submit(next(starts)) for _ in range(workers * RANGES_IN_FLIGHT_PER_WORKER))
+                while (number := pending.popleft().result()) is None:
+                    pending.append(submit(next(starts)))
+                executor.shutdown(cancel_futures=True)
+
+        assert number is not None
+        if stats is not None:
+            stats.tested, stats.found = number + 1, 1
+            stats.tick()
+        return number
 
 
 def main() -> None:
     secret_key = "yzbqklnj"
 
-    answer = mine_coins(secret_key, zeroes=5)
-    print(f"Answer: {answer}")
-
-    answer = mine_coins(secret_key, zeroes=6)
-    print(f"Answer: {answer}")
+    answers = mine_all_coins(secret_key, zeroes=(5, 6))
+    for _, answer in sorted(answers.items()):
+        print(f"Answer: {answer}")
 
 
 if __name__ == "__main__":
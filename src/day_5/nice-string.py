@@ -1,9 +1,15 @@
+import sys
 from pathlib import Path
 
+if __name__ == "__main__":
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from toolkit.inputs import MappedLines
+from toolkit.inputs import map_input
+
 
-def load_strings(file_path: Path) -> list[str]:
-    with file_path.open("r") as file:
-        return file.readlines()
+def load_strings(file_path: Path) -> MappedLines:
+    return MappedLines(map_input(file_path))
 
 
 def is_nice_string(string: str) -> bool:
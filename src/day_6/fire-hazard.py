@@ -69,6 +69,25 @@ def install_simple_lighting(instructions: list[Instruction]) -> LightMap:
     return lights
 
 
+def count_simple_lighting_by_rows(instructions: list[Instruction]) -> int:
+    """Keep every row as an int bitmask, so a span of a row is switched by a single bitwise operation."""
+    rows = [0] * GRID_HEIGHT
+
+    for instruction in instructions:
+        span = ((1 << (instruction.x2 - instruction.x1 + 1)) - 1) << instruction.x1
+        match instruction.action:
+            case Action.TURN_ON:
+                for y in range(instruction.y1, instruction.y2 + 1):
+                    rows[y] |= span
+            case Action.TURN_OFF:
+                for y in range(instruction.y1, instruction.y2 + 1):
+                    rows[y] &= ~span
+            case Action.TOGGLE:
+                for y in range(instruction.y1, instruction.y2 + 1):
+                    rows[y] ^= span
+    return sum(row.bit_count() for row in rows)
+
+
 def install_lighting_with_brightness(instructions: list[Instruction]) -> LightMap:
     lights: LightMap = defaultdict(int)
 
@@ -1,9 +1,16 @@
+import sys
+from collections.abc import Iterable
 from pathlib import Path
 
+if __name__ == "__main__":
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from toolkit.inputs import MappedLines
+from toolkit.inputs import map_input
+
 
-def load_string_literals(file_path: Path) -> list[str]:
-    with file_path.open("r") as file:
-        return [line.strip() for line in file]
+def load_string_literals(file_path: Path) -> MappedLines:
+    return MappedLines(map_input(file_path))
 
 
 def calculate_string_memory_delta(literal: str) -> int:
@@ -16,7 +23,7 @@ def encode_literal(literal: str) -> str:
     return f'"{literal}"'
 
 
-def calculate_string_encoding_deltas(string_literals: list[str], encoded_strings: list[str]) -> list[int]:
+def calculate_string_encoding_deltas(string_literals: Iterable[str], encoded_strings: Iterable[str]) -> list[int]:
     return [len(encoded) - len(literal) for literal, encoded in zip(string_literals, encoded_strings, strict=True)]
 
 
@@ -1,7 +1,17 @@
+import sys
 from collections import defaultdict
 from collections.abc import Callable
 from pathlib import Path
 
+if __name__ == "__main__":
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from toolkit.search import Problem
+from toolkit.search import best_first_search
+from toolkit.search import branch_and_bound
+
+type Route = tuple[int, int, int]  # (signed distance so far, mask of visited locations, current location)
+
 
 def parse_record(record: str) -> tuple[str, str, int]:
     trip, _, distance = record.partition(" = ")
@@ -95,6 +105,49 @@ def find_longest_path(matrix: dict[str, dict[str, int]]) -> tuple[list[str], int
     return tsp.solve(lambda x, y: x > y, -(10**9))
 
 
+def find_path_with_search(matrix: dict[str, dict[str, int]], *, longest: bool = False) -> int:
+    """
+    Search routes location by location. Routes that visited the same locations and stand at the same one
+    share their futures, so only the best of them is extended (which is what Held-Karp tabulates).
+    The longest route is the shortest one with negated distances, found by branch and bound.
+    """
+    tsp = TravelingSalesperson(matrix)
+    count, dist = tsp.location_count, tsp.dist
+    sign = -1 if longest else 1
+    if count == 0:
+        return sign * 10**9  # what `TravelingSalesperson.solve` reports without any route
+    everyone = (1 << count) - 1
+    best_edge = min((sign * dist[i][j] for i in range(count) for j in range(count) if i != j), default=0)
+
+    def bound(route: Route) -> int:
+        distance, visited, current = route
+        legs_left = count - visited.bit_count() if current != -1 else count - 1
+        return distance + best_edge * legs_left
+
+    def expand(route: Route) -> list[Route]:
+        distance, visited, current = route
+        if current == -1:
+            return [(0, 1 << start, start) for start in range(count)]
+        unvisited = [nxt for nxt in range(count) if not visited & (1 << nxt)]
+        children = [(distance + sign * dist[current][nxt], visited | (1 << nxt), nxt) for nxt in unvisited]
+        return sorted(children)  # the nearest (or farthest) locations first
+
+    problem: Problem[Route, int] = Problem(
+        start=(0, 0, -1),
+        expand=expand,
+        is_goal=lambda route: route[1] == everyone,
+        cost=lambda route: route[0],
+        bound=bound,
+        key=lambda route: (route[1], route[2]),
+    )
+    if longest:
+        best = branch_and_bound(problem, f"find the longest route through {count} locations")
+    else:
+        best = best_first_search(problem, f"find the shortest route through {count} locations")
+    assert best is not None
+    return sign * best[0]
+
+
 def main() -> None:
     data = load_distances(Path("input.data"))
     distance_matrix = create_distance_matrix(data)
@@ -1,5 +1,286 @@
+import asyncio
+from argparse import ArgumentParser
+from argparse import Namespace
+from json import dumps
+from pathlib import Path
+from time import perf_counter
+
+from toolkit.benchmarks import BENCHMARKS
+from toolkit.benchmarks import format_results
+from toolkit.benchmarks import run_benchmark
+from toolkit.cache import ResultCache
+from toolkit.crosscheck import CHECKS
+from toolkit.crosscheck import format_mismatch
+from toolkit.crosscheck import run_cross_check
+from toolkit.fetch import DEFAULT_ENDPOINT
+from toolkit.fetch import DEFAULT_INPUT_CACHE
+from toolkit.fetch import MAX_CONNECTIONS
+from toolkit.fetch import SESSION_VARIABLE
+from toolkit.fetch import fetch_inputs
+from toolkit.fetch import format_fetch_result
+from toolkit.fetch import load_accounts
+from toolkit.generators import generate_input
+from toolkit.history import DEFAULT_HISTORY
+from toolkit.history import BenchmarkHistory
+from toolkit.history import find_regressions
+from toolkit.history import format_comparisons
+from toolkit.history import format_runs
+from toolkit.registry import find_solutions
+from toolkit.registry import get_puzzle
+from toolkit.runner import RunOptions
+from toolkit.runner import TimeBudget
+from toolkit.runner import check_memory_budgets
+from toolkit.runner import dump_reports
+from toolkit.runner import find_failures
+from toolkit.runner import find_inputs
+from toolkit.runner import find_timeouts
+from toolkit.runner import format_reports
+from toolkit.runner import format_searches
+from toolkit.runner import run_batch
+from toolkit.runner import run_puzzle
+from toolkit.runner import run_puzzles_in_parallel
+from toolkit.runner import run_puzzles_with_budget
+from toolkit.server import DEFAULT_PORT
+from toolkit.server import run_server
+
+
+def run_days(args: Namespace) -> None:
+    days = args.days or list(find_solutions())
+    if args.input is not None and (len(days) != 1 or args.jobs != 1):
+        raise SystemExit("--input can be used with a single day only")
+    try:
+        for day in days:
+            get_puzzle(day)
+    except LookupError as error:
+        raise SystemExit(str(error)) from None
+    budget = TimeBudget(day=args.day_budget, part=args.part_budget)
+
+    results = ResultCache(args.cache) if args.cache is not None else None
+    options = RunOptions(
+        profile_dir=args.profile,
+        trace_memory=args.memory,
+        results=results,
+        reuse_parsed=args.reuse_parsed,
+        search_stats=args.search_stats,
+        heatmap_dir=args.heatmap,
+        heatmap_branches=args.branches,
+    )
+
+    started = perf_counter()
+    if budget != TimeBudget():
+        reports = run_puzzles_with_budget(days, budget, args.jobs or None, options, args.input)
+    elif args.jobs == 1:
+        reports = [run_puzzle(day, args.input, options) for day in days]
+    else:
+        reports = run_puzzles_in_parallel(days, args.jobs or None, options)
+    elapsed = perf_counter() - started
+
+    print(format_reports(reports))
+    print(f"Elapsed {elapsed:.4f} s")
+    failures = find_timeouts(reports) + find_failures(reports)
+    if args.search_stats or failures:
+        print(format_searches(reports))
+    if args.json is not None:
+        dump_reports(reports, args.json, elapsed=elapsed)
+
+    if args.memory and args.input is None:
+        failures.extend(check_memory_budgets(reports))
+    if failures:
+        raise SystemExit("\n".join(failures))
+
+
+def solve_batch(args: Namespace) -> None:
+    inputs = find_inputs(args.inputs)
+    if not inputs:
+        raise SystemExit("No input files matched")
+
+    results = ResultCache(args.cache) if args.cache is not None else None
+    options = RunOptions(results=results, reuse_parsed=args.reuse_parsed)
+    try:
+        for record in run_batch(args.day, inputs, args.jobs or None, options):
+            print(dumps(record), flush=True)
+    except LookupError as error:
+        raise SystemExit(str(error)) from None
+
+
+def run_benchmarks(args: Namespace) -> None:
+    benchmarks = [benchmark for benchmark in BENCHMARKS if not args.days or benchmark.day in args.days]
+    if args.sizes and len(benchmarks) != 1:
+        raise SystemExit("--sizes can be used with a single benchmark only")
+
+    measured = []
+    for benchmark in benchmarks:
+        results = run_benchmark(benchmark, args.sizes, warmup=args.warmup, repeat=args.repeat)
+        print(format_results(results), end="\n\n", flush=True)
+        measured.extend(results)
+
+    if args.save:
+        history = BenchmarkHistory(args.history)
+        print(f"Saved as run #{history.record(measured)}")
+        history.close()
+
+
+def list_benchmark_runs(args: Namespace) -> None:
+    history = BenchmarkHistory(args.history)
+    print(format_runs(history.list_runs()))
+    history.close()
+
+
+def compare_benchmark_runs(args: Namespace) -> None:
+    history = BenchmarkHistory(args.history)
+    runs = {run.id: run for run in history.list_runs()}
+    if len(runs) < 2 and (args.baseline is None or args.candidate is None):
+        raise SystemExit("There must be at least two saved runs to compare")
+
+    run_ids = list(runs)
+    baseline_id = args.baseline if args.baseline is not None else run_ids[-2]
+    candidate_id = args.candidate if args.candidate is not None else run_ids[-1]
+    if unknown := [f"#{run_id}" for run_id in (baseline_id, candidate_id) if run_id not in runs]:
+        history.close()
+        raise SystemExit(f"Unknown run(s) {', '.join(unknown)}: see `history list` for the saved ones")
+
+    baseline, candidate = runs[baseline_id], runs[candidate_id]
+    if baseline.machine != candidate.machine:
+        print(f"Warning: run #{baseline.id} and run #{candidate.id} were measured on different machines")
+
+    comparisons = history.compare(baseline.id, candidate.id)
+    regressions = find_regressions(comparisons, alpha=args.alpha, threshold=args.threshold)
+    history.close()
+
+    print(f"Run #{baseline.id} ({baseline.git_commit}) -> run #{candidate.id} ({candidate.git_commit})")
+    print(format_comparisons(comparisons, regressions))
+    if regressions:
+        raise SystemExit(f"{len(regressions)} benchmark(s) got significantly slower")
+
+
+def cross_check(args: Namespace) -> None:
+    mismatches = []
+    for check in CHECKS:
+        if not args.days or check.day in args.days:
+            found = run_cross_check(check, cases=args.cases, seed=args.seed)
+            print(
+                f"day {check.day:>2}  {check.name}: {len(check.engines) - len(found)}/{len(check.engines)} engines agree"
+            )
+            mismatches.extend(found)
+
+    if mismatches:
+        raise SystemExit("\n".join(map(format_mismatch, mismatches)))
+
+
+def generate(args: Namespace) -> None:
+    try:
+        generate_input(args.day, args.size, args.output, seed=args.seed)
+    except LookupError as error:
+        raise SystemExit(str(error)) from None
+
+
+def fetch(args: Namespace) -> None:
+    try:
+        accounts = load_accounts(args.accounts)
+    except ValueError as error:
+        raise SystemExit(str(error)) from None
+    if not accounts:
+        raise SystemExit(f"No accounts: pass --accounts or set {SESSION_VARIABLE}")
+
+    days = args.days or [day for day in find_solutions() if get_puzzle(day).has_input]
+    started, failed = perf_counter(), 0
+    results = fetch_inputs(
+        days, accounts, endpoint=args.endpoint, cache_dir=args.cache, jobs=args.jobs, force=args.force
+    )
+    for result in results:
+        print(format_fetch_result(result), flush=True)
+        failed += result.error is not None
+    print(f"Elapsed {perf_counter() - started:.4f} s")
+
+    if failed:
+        raise SystemExit(f"{failed} input(s) could not be fetched")
+
+
+def serve(args: Namespace) -> None:
+    try:
+        asyncio.run(run_server(args.port))
+    except KeyboardInterrupt:
+        pass
+
+
 def main() -> None:
-    print("Advent of Code 2015")
+    parser = ArgumentParser(description="Advent of Code 2015")
+    commands = parser.add_subparsers(required=True)
+
+    run = commands.add_parser("run", help="solve the selected days and time every phase")
+    run.add_argument("days", nargs="*", type=int, help="days to solve (all of them by default)")
+    run.add_argument("--input", type=Path, help="an alternative input file for a single day")
+    run.add_argument("--jobs", type=int, default=1, help="worker processes to spread days over (0 means all cores)")
+    run.add_argument("--json", type=Path, help="also write the report to this JSON file")
+    run.add_argument("--profile", type=Path, help="profile every phase, saving .pstats and .folded files here")
+    run.add_argument("--memory", action="store_true", help="trace peak memory and fail on days over their budget")
+    run.add_argument("--cache", type=Path, help="reuse answers stored here for unchanged inputs and code")
+    run.add_argument("--reuse-parsed", action="store_true", help="keep parsed inputs pickled next to the input files")
+    run.add_argument("--heatmap", type=Path, help="count line hits of the solutions, saving listings here")
+    run.add_argument("--branches", action="store_true", help="also count branch directions, about 5x slower")
+    run.add_argument("--search-stats", action="store_true", help="count nodes, candidates and prunes of the searches")
+    run.add_argument("--day-budget", type=float, help="seconds a day may take before its worker is killed")
+    run.add_argument("--part-budget", type=float, help="seconds parsing or a single part may take")
+    run.set_defaults(handler=run_days)
+
+    batch = commands.add_parser("batch", help="solve a day against many inputs, printing JSON lines as they finish")
+    batch.add_argument("day", type=int)
+    batch.add_argument("inputs", nargs="+", help="input files, directories or glob patterns")
+    batch.add_argument("--jobs", type=int, default=0, help="worker processes (all cores by default)")
+    batch.add_argument("--cache", type=Path, help="reuse answers stored here for unchanged inputs and code")
+    batch.add_argument("--reuse-parsed", action="store_true", help="keep parsed inputs pickled next to the input files")
+    batch.set_defaults(handler=solve_batch)
+
+    bench = commands.add_parser("bench", help="measure how the hot function of every day scales")
+    bench.add_argument("days", nargs="*", type=int, help="days to benchmark (all of them by default)")
+    bench.add_argument("--sizes", nargs="+", type=int, help="override the sizes of a single benchmark")
+    bench.add_argument("--warmup", type=int, default=1, help="untimed calls before measuring")
+    bench.add_argument("--repeat", type=int, default=5, help="timed calls per size")
+    bench.add_argument("--save", action="store_true", help="record the results in the benchmark history")
+    bench.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="the benchmark history database")
+    bench.set_defaults(handler=run_benchmarks)
+
+    history = commands.add_parser("history", help="inspect saved benchmark runs")
+    history.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="the benchmark history database")
+    history_commands = history.add_subparsers(required=True)
+    history_commands.add_parser("list", help="list saved runs").set_defaults(handler=list_benchmark_runs)
+    compare = history_commands.add_parser("compare", help="flag significant slowdowns between two runs")
+    compare.add_argument("baseline", nargs="?", type=int, help="a run id (the second to last run by default)")
+    compare.add_argument("candidate", nargs="?", type=int, help="a run id (the last run by default)")
+    compare.add_argument("--alpha", type=float, default=0.05, help="significance level of the Mann-Whitney U test")
+    compare.add_argument("--threshold", type=float, default=0.05, help="ignore slowdowns below this relative change")
+    compare.set_defaults(handler=compare_benchmark_runs)
+
+    check = commands.add_parser("crosscheck", help="compare alternative engines with the reference solutions")
+    check.add_argument("days", nargs="*", type=int, help="days to check (all of them by default)")
+    check.add_argument("--cases", type=int, default=100, help="random cases per check")
+    check.add_argument("--seed", type=int, default=2015)
+    check.set_defaults(handler=cross_check)
+
+    gen = commands.add_parser("generate", help="write a synthetic input of arbitrary scale for a day")
+    gen.add_argument("day", type=int)
+    gen.add_argument("size", type=int, help="lines, symbols, cities, wires... depending on the day")
+    gen.add_argument("output", type=Path)
+    gen.add_argument("--seed", type=int, default=2015)
+    gen.set_defaults(handler=generate)
+
+    download = commands.add_parser("fetch", help="download the puzzle inputs of many accounts into the input cache")
+    download.add_argument("days", nargs="*", type=int, help="days to fetch (all days with an input by default)")
+    download.add_argument(
+        "--accounts", type=Path, help=f"a file of `name session` lines (${SESSION_VARIABLE} otherwise)"
+    )
+    download.add_argument("--endpoint", default=DEFAULT_ENDPOINT, help="the site, or a stand-in like `main.py serve`")
+    download.add_argument("--cache", type=Path, default=DEFAULT_INPUT_CACHE, help="where inputs are stored per account")
+    download.add_argument("--jobs", type=int, default=MAX_CONNECTIONS, help="concurrent keep-alive connections")
+    download.add_argument("--force", action="store_true", help="download inputs that are already cached again")
+    download.set_defaults(handler=fetch)
+
+    server = commands.add_parser("serve", help="answer queries against the parsed inputs over HTTP on localhost")
+    server.add_argument("--port", type=int, default=DEFAULT_PORT)
+    server.set_defaults(handler=serve)
+
+    args = parser.parse_args()
+    args.handler(args)
 
 
 if __name__ == "__main__":
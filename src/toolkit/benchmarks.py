@@ -0,0 +1,346 @@
+from collections.abc import Callable
+from collections.abc import Iterable
+from dataclasses import dataclass
+from gc import disable
+from gc import enable
+from gc import isenabled
+from random import Random
+from statistics import fmean
+from statistics import median
+from statistics import stdev
+from time import perf_counter
+from types import ModuleType
+from typing import Any
+
+from toolkit.registry import load_solution
+
+SEED = 2015
+
+type Thunk = Callable[[], Any]
+type Preparer = Callable[[ModuleType, int, Random], Thunk]
+
+
+@dataclass(frozen=True, slots=True)
+class Benchmark:
+    """
+    A day's hot function measured at different scales.
+    `prepare` builds an input of the given size outside the timed region and returns the call to measure.
+    """
+
+    name: str
+    day: int
+    knob: str
+    sizes: tuple[int, ...]
+    prepare: Preparer
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkResult:
+    name: str
+    knob: str
+    size: int
+    samples: list[float]
+
+    @property
+    def best(self) -> float:
+        return min(self.samples)
+
+    @property
+    def median(self) -> float:
+        return median(self.samples)
+
+    @property
+    def mean(self) -> float:
+        return fmean(self.samples)
+
+    @property
+    def stdev(self) -> float:
+        return stdev(self.samples) if len(self.samples) > 1 else 0.0
+
+
+def measure(thunk: Thunk, *, warmup: int, repeat: int) -> list[float]:
+    """Time `repeat` calls after `warmup` untimed ones; the GC is paused like `timeit` does."""
+    for _ in range(warmup):
+        thunk()
+
+    gc_was_enabled = isenabled()
+    disable()
+    try:
+        samples = []
+        for _ in range(repeat):
+            started = perf_counter()
+            thunk()
+            samples.append(perf_counter() - started)
+        return samples
+    finally:
+        if gc_was_enabled:
+            enable()
+
+
+def run_benchmark(
+    benchmark: Benchmark, sizes: Iterable[int] | None = None, *, warmup: int = 1, repeat: int = 5
+) -> list[BenchmarkResult]:
+    module = load_solution(benchmark.day)
+    results = []
+    for size in sizes or benchmark.sizes:
+        thunk = benchmark.prepare(module, size, Random(SEED))
+        samples = measure(thunk, warmup=warmup, repeat=repeat)
+        results.append(BenchmarkResult(benchmark.name, benchmark.knob, size, samples))
+    return results
+
+
+def format_results(results: Iterable[BenchmarkResult]) -> str:
+    lines = [f"{'benchmark':<45}  {'size':>16}  {'best, s':>10}  {'median, s':>10}  {'mean, s':>10}  {'stdev, s':>10}"]
+    for result in results:
+        size = f"{result.knob}={result.size}"
+        lines.append(
+            f"{result.name:<45}  {size:>16}  {result.best:>10.5f}  {result.median:>10.5f}  "
+            f"{result.mean:>10.5f}  {result.stdev:>10.5f}"
+        )
+    return "\n".join(lines)
+
+
+def _bench_floors(module: ModuleType, size: int, rng: Random) -> Thunk:
+    # the basement is reached only by the very last instruction
+    route = b"(" * (size // 2) + b")" * (size - size // 2 + 1)
+    return lambda: module.find_instruction(route, floor=-1)
+
+
+def _bench_wrapping(module: ModuleType, size: int, rng: Random) -> Thunk:
+    prisms = [
+        module.Prism(length=rng.randint(1, 30), width=rng.randint(1, 30), height=rng.randint(1, 30))
+        for _ in range(size)
+    ]
+
+    def wrap() -> tuple[int, int]:
+        paper = sum(module.calculate_paper_for_boxing(prism) for prism in prisms)
+        ribbon = sum(module.calculate_ribbon_size(prism) for prism in prisms)
+        return paper, ribbon
+
+    return wrap
+
+
+def _bench_houses(module: ModuleType, size: int, rng: Random) -> Thunk:
+    route = "".join(rng.choices("^v<>", k=size)).encode()
+    return lambda: module.get_unique_houses(route, 2)
+
+
+def _bench_mining(module: ModuleType, size: int, rng: Random) -> Thunk:
+    return lambda: module.mine_coins("yzbqklnj", zeroes=size)
+
+
+def _bench_nice_strings(module: ModuleType, size: int, rng: Random) -> Thunk:
+    strings = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=16)) for _ in range(size)]
+
+    def count() -> tuple[int, int]:
+        nice = sum(1 for string in strings if module.is_nice_string(string))
+        ridiculous = sum(1 for string in strings if module.is_ridiculous_nice_string(string))
+        return nice, ridiculous
+
+    return count
+
+
+def _bench_lighting(module: ModuleType, size: int, rng: Random) -> Thunk:
+    instructions = []
+    for _ in range(size):
+        x1, y1 = rng.randrange(module.GRID_WIDTH), rng.randrange(module.GRID_HEIGHT)
+        x2, y2 = (
+            min(x1 + rng.randrange(100), module.GRID_WIDTH - 1),
+            min(y1 + rng.randrange(100), module.GRID_HEIGHT - 1),
+        )
+        instructions.append(module.Instruction(x1=x1, y1=y1, x2=x2, y2=y2, action=rng.choice(list(module.Action))))
+    return lambda: module.install_lighting_with_brightness(instructions)
+
+
+def _bench_circuit(module: ModuleType, size: int, rng: Random) -> Thunk:
+    # a heap-shaped circuit keeps the recursion depth logarithmic in the number of wires
+    circuit = {}
+    for index in range(size):
+        left, right = 2 * index + 1, 2 * index + 2
+        if right < size:
+            circuit[f"w{index}"] = f"w{left} {rng.choice(['AND', 'OR'])} w{right}"
+        elif left < size:
+            circuit[f"w{index}"] = f"NOT w{left}"
+        else:
+            circuit[f"w{index}"] = str(rng.randrange(1 << 16))
+    return lambda: module.evaluate("w0", circuit, {})
+
+
+def _bench_literals(module: ModuleType, size: int, rng: Random) -> Thunk:
+    pieces = ["a", "b", "c", "\\\\", '\\"', "\\x27", "\\x4f"]
+    literals = ['"' + "".join(rng.choices(pieces, k=12)) + '"' for _ in range(size)]
+    return lambda: sum(module.calculate_string_memory_delta(literal) for literal in literals)
+
+
+def _bench_traveling(module: ModuleType, size: int, rng: Random) -> Thunk:
+    cities = [f"City{index}" for index in range(size)]
+    matrix: dict[str, dict[str, int]] = {city: {} for city in cities}
+    for i, departure in enumerate(cities):
+        for arrival in cities[i + 1 :]:
+            matrix[departure][arrival] = matrix[arrival][departure] = rng.randint(1, 200)
+
+    tsp = module.TravelingSalesperson(matrix)
+    return lambda: tsp.solve(lambda x, y: x < y, 10**9)
+
+
+def _bench_look_and_say(module: ModuleType, size: int, rng: Random) -> Thunk:
+    return lambda: module.dictate_number_with_repetition("1113222113", size)
+
+
+def _bench_passwords(module: ModuleType, size: int, rng: Random) -> Thunk:
+    def rotate() -> str:
+        password = "hepxcrrq"
+        for _ in range(size):
+            password = module.update_password(password)
+        return password
+
+    return rotate
+
+
+def _bench_json_sum(module: ModuleType, size: int, rng: Random) -> Thunk:
+    def make_node(budget: int) -> Any:
+        if budget <= 1:
+            return rng.choice([rng.randint(-100, 100), "red", "blue"])
+        if rng.random() < 0.5:
+            return [make_node(budget // 3) for _ in range(3)]
+        return {f"k{index}": make_node(budget // 3) for index in range(3)}
+
+    document = make_node(size)
+    return lambda: module.sum_all_numbers_without_red_property(document)
+
+
+def _bench_seating(module: ModuleType, size: int, rng: Random) -> Thunk:
+    guests = [f"Guest{index}" for index in range(size)]
+    changes = {(a, b): rng.randint(-100, 100) for a in guests for b in guests if a != b}
+    return lambda: module.find_optimal_arrangement(changes)
+
+
+def _bench_reindeer_race(module: ModuleType, size: int, rng: Random) -> Thunk:
+    reindeers = [
+        module.Reindeer(
+            name=f"Deer{index}",
+            speed=rng.randint(1, 30),
+            flying_time=rng.randint(1, 20),
+            resting_time=rng.randint(20, 200),
+        )
+        for index in range(9)
+    ]
+    return lambda: module.calculate_winner_by_scoring_system(reindeers, size)
+
+
+def _bench_cookies(module: ModuleType, size: int, rng: Random) -> Thunk:
+    ingredients = [
+        module.Ingredient(f"Ingredient{index}", *(rng.randint(-3, 5) for _ in range(4)), calories=rng.randint(1, 9))
+        for index in range(4)
+    ]
+    return lambda: module.find_best_cookie_score(ingredients, size)
+
+
+def _bench_aunt_sue(module: ModuleType, size: int, rng: Random) -> Thunk:
+    properties = [
+        "children",
+        "cats",
+        "samoyeds",
+        "pomeranians",
+        "akitas",
+        "vizslas",
+        "goldfish",
+        "trees",
+        "cars",
+        "perfumes",
+    ]
+    sues = [
+        module.Sue(index + 1, **{key: rng.randint(0, 10) for key in rng.sample(properties, 3)}) for index in range(size)
+    ]
+    aim = module.Sue(0, **{key: 11 for key in properties})  # nobody matches, so every record is checked
+    return lambda: module.find_matching_sue(aim, sues)
+
+
+def _bench_containers(module: ModuleType, size: int, rng: Random) -> Thunk:
+    containers = [module.Container(rng.randint(5, 50)) for _ in range(size)]
+    refrigerator = module.Refrigerator(capacity=150)
+    return lambda: refrigerator.find_fitting_combinations(containers)
+
+
+def _bench_animation(module: ModuleType, size: int, rng: Random) -> Thunk:
+    grid = [[rng.random() < 0.5 for _ in range(size)] for _ in range(size)]
+    return lambda: module.animate(grid)
+
+
+def _bench_replacements(module: ModuleType, size: int, rng: Random) -> Thunk:
+    elements = ["H", "O", "Ca", "Ti", "Rn", "Ar", "Si", "Th"]
+    replacements = [(source, rng.choice(elements) + rng.choice(elements)) for source in elements for _ in range(3)]
+    molecule = "".join(rng.choices(elements, k=size))
+    return lambda: module.generate_replacements(replacements, molecule)
+
+
+def _bench_lowest_house(module: ModuleType, size: int, rng: Random) -> Thunk:
+    return lambda: module.find_lowest_house(size, 10)
+
+
+def _bench_shopping(module: ModuleType, size: int, rng: Random) -> Thunk:
+    shop = module.load_shop()
+    boss = module.Player.make_player("Boss", hitpoints=size, base_damage=9, base_armor=2)
+    return lambda: module.find_minimum_gold_to_win(boss, shop)
+
+
+def _bench_wizard(module: ModuleType, size: int, rng: Random) -> Thunk:
+    spells = module.load_spells()
+
+    def fight() -> int:
+        player = module.Player(hitpoints=50, mana=500)
+        boss = module.Player(hitpoints=size, mana=0, damage=9)
+        return int(module.find_least_mana_to_win(player, boss, spells, hard_mode=False))
+
+    return fight
+
+
+def _bench_program(module: ModuleType, size: int, rng: Random) -> Thunk:
+    # counts the Collatz steps of register `a` into register `b`
+    source = ["jio a, +8", "inc b", "jie a, +4", "tpl a", "inc a", "jmp -5", "hlf a", "jmp -7"]
+    program = module.Program([module.Instruction.from_str(line) for line in source])
+
+    def execute() -> None:
+        for start in range(1, size + 1):
+            program.execute(module.make_computer(start, 0))
+
+    return execute
+
+
+def _bench_packages(module: ModuleType, size: int, rng: Random) -> Thunk:
+    weights = sorted(rng.sample(range(1, 20 * size), size))
+    weights[-1] += (-sum(weights)) % 3  # an even three-way split needs a total divisible by three
+    return lambda: module.distribute_packages(tuple(weights), 3)
+
+
+def _bench_code_grid(module: ModuleType, size: int, rng: Random) -> Thunk:
+    return lambda: module.find_code(size, size)
+
+
+BENCHMARKS: list[Benchmark] = [
+    Benchmark("find_instruction", 1, "moves", (10_000, 100_000, 1_000_000), _bench_floors),
+    Benchmark("calculate_paper_for_boxing+ribbon", 2, "boxes", (1_000, 10_000, 100_000), _bench_wrapping),
+    Benchmark("get_unique_houses", 3, "moves", (10_000, 100_000, 1_000_000), _bench_houses),
+    Benchmark("mine_coins", 4, "zeroes", (3, 4, 5), _bench_mining),
+    Benchmark("is_nice_string+ridiculous", 5, "strings", (1_000, 10_000, 100_000), _bench_nice_strings),
+    Benchmark("install_lighting_with_brightness", 6, "instructions", (10, 100, 1_000), _bench_lighting),
+    Benchmark("evaluate", 7, "wires", (1_000, 10_000, 100_000), _bench_circuit),
+    Benchmark("calculate_string_memory_delta", 8, "literals", (1_000, 10_000, 100_000), _bench_literals),
+    Benchmark("TravelingSalesperson.solve", 9, "cities", (6, 8, 10, 12), _bench_traveling),
+    Benchmark("dictate_number_with_repetition", 10, "iterations", (20, 30, 40), _bench_look_and_say),
+    Benchmark("update_password", 11, "passwords", (1, 2, 4), _bench_passwords),
+    Benchmark("sum_all_numbers_without_red_property", 12, "nodes", (1_000, 100_000, 1_000_000), _bench_json_sum),
+    Benchmark("find_optimal_arrangement", 13, "guests", (6, 7, 8, 9), _bench_seating),
+    Benchmark("calculate_winner_by_scoring_system", 14, "seconds", (1_000, 10_000, 100_000), _bench_reindeer_race),
+    Benchmark("find_best_cookie_score", 15, "teaspoons", (25, 50, 100), _bench_cookies),
+    Benchmark("find_matching_sue", 16, "records", (1_000, 10_000, 100_000), _bench_aunt_sue),
+    Benchmark("Refrigerator.find_fitting_combinations", 17, "containers", (12, 16, 20), _bench_containers),
+    Benchmark("animate", 18, "grid", (25, 50, 100, 200), _bench_animation),
+    Benchmark("generate_replacements", 19, "elements", (100, 1_000, 10_000), _bench_replacements),
+    Benchmark("find_lowest_house", 20, "target", (10_000, 100_000, 1_000_000), _bench_lowest_house),
+    Benchmark("find_minimum_gold_to_win", 21, "hitpoints", (100, 1_000, 10_000), _bench_shopping),
+    Benchmark("find_least_mana_to_win", 22, "hitpoints", (20, 40, 58), _bench_wizard),
+    Benchmark("Program.execute", 23, "starts", (100, 1_000, 10_000), _bench_program),
+    Benchmark("distribute_packages", 24, "packages", (12, 18, 24), _bench_packages),
+    Benchmark("find_code", 25, "diagonal", (100, 1_000, 3_000), _bench_code_grid),
+]
@@ -0,0 +1,88 @@
+from collections.abc import Callable
+from functools import cache
+from hashlib import file_digest
+from hashlib import sha256
+from os import replace
+from pathlib import Path
+from pickle import HIGHEST_PROTOCOL
+from pickle import dumps
+from pickle import loads
+from tempfile import NamedTemporaryFile
+
+from toolkit.registry import find_solutions
+
+
+@cache
+def get_code_version(day: int) -> str:
+    """
+    Hash the day's solution together with every toolkit module: the registry holds the parameters of both parts,
+    and the days parse and search through the shared inputs, search and telemetry modules.
+    """
+    digest = sha256()
+    for path in [find_solutions()[day], *sorted(Path(__file__).parent.glob("*.py"))]:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def hash_file(path: Path) -> str:
+    with path.open("rb") as file:
+        return file_digest(file, "sha256").hexdigest()
+
+
+def write_atomically(path: Path, content: bytes) -> None:
+    """Readers never see a half-written file, even when process pool workers race for the same path."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile("wb", dir=path.parent, delete=False) as file:
+        file.write(content)
+    replace(file.name, path)
+
+
+def parse_with_cache[T](day: int, input_path: Path, parse: Callable[[], T]) -> T:
+    """
+    Reuse the parsed form of an input pickled next to it by an earlier run.
+    The file name carries a hash of the input bytes and the code version, so stale copies are never read.
+    """
+    key = sha256(f"{day}:{hash_file(input_path)}:{get_code_version(day)}".encode()).hexdigest()
+    path = input_path.with_name(f".{input_path.name}.{key[:16]}.pickle")
+    try:
+        parsed: T = loads(path.read_bytes())
+        return parsed
+    except FileNotFoundError:
+        pass
+
+    parsed = parse()
+    try:
+        content = dumps(parsed, protocol=HIGHEST_PROTOCOL)
+    except TypeError:
+        return parsed  # memory-mapped inputs cannot be pickled, but they are already as cheap to load as it gets
+
+    for stale in input_path.parent.glob(f".{input_path.name}.*.pickle"):
+        stale.unlink(missing_ok=True)
+    write_atomically(path, content)
+    return parsed
+
+
+class ResultCache:
+    """
+    An on-disk store of answers addressed by the input bytes, the part being solved and the code version,
+    so an edit of either the input or the code simply leads to a different key.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def make_key(self, day: int, part: str, input_path: Path | None) -> str:
+        input_hash = hash_file(input_path) if input_path is not None else "-"
+        return sha256(f"{day}:{part}:{input_hash}:{get_code_version(day)}".encode()).hexdigest()
+
+    def load(self, key: str) -> str | None:
+        try:
+            return self._locate(key).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def store(self, key: str, answer: str) -> None:
+        write_atomically(self._locate(key), answer.encode("utf-8"))
+
+    def _locate(self, key: str) -> Path:
+        return self.root / key[:2] / key[2:]
@@ -0,0 +1,393 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from random import Random
+from tempfile import TemporaryDirectory
+from types import ModuleType
+from typing import Any
+
+from toolkit.generators import make_names
+from toolkit.registry import load_solution
+
+SEED = 2015
+
+type Records = list[Any]
+type Generator = Callable[[ModuleType, int, Random], Records]
+type Engine = Callable[[ModuleType, Records], Any]
+
+
+@dataclass(frozen=True, slots=True)
+class CrossCheck:
+    """
+    A reference implementation and the alternative engines that must agree with it.
+    Cases are lists of records (instructions, reindeer, ...) so that any failing case
+    can be shrunk by dropping records while the engines still disagree.
+    """
+
+    name: str
+    day: int
+    generate: Generator
+    reference: Engine
+    engines: dict[str, Engine]
+    max_size: int
+
+
+@dataclass(frozen=True, slots=True)
+class Mismatch:
+    check: str
+    engine: str
+    records: Records
+    expected: Any
+    actual: Any
+
+
+def _solve(engine: Engine, module: ModuleType, records: Records) -> Any:
+    """An engine's answer or, when it crashes, a description of the crash to compare against."""
+    try:
+        return engine(module, records)
+    except Exception as error:
+        return f"{type(error).__name__}: {error}"
+
+
+def shrink(records: Records, fails: Callable[[Records], bool]) -> Records:
+    """
+    Drop chunks of records, halving the chunk size whenever no chunk can be dropped,
+    until removing any single record makes the failure disappear (delta debugging).
+    """
+    chunk = max(1, len(records) // 2)
+    while records:
+        start, shrunk = 0, False
+        while start < len(records):
+            candidate = records[:start] + records[start + chunk :]
+            if fails(candidate):
+                records, shrunk = candidate, True
+            else:
+                start += chunk
+
+        if chunk == 1 and not shrunk:
+            break
+        chunk = max(1, chunk // 2) if not shrunk else chunk
+    return records
+
+
+def run_cross_check(check: CrossCheck, *, cases: int = 100, seed: int = SEED) -> list[Mismatch]:
+    """Compare every engine with the reference on random cases, reporting the first one it fails, shrunk."""
+    module = load_solution(check.day)
+    rng = Random(seed)
+    pending = dict(check.engines)
+    mismatches = []
+
+    for _ in range(cases):
+        records = check.generate(module, rng.randint(1, check.max_size), rng)
+        expected = _solve(check.reference, module, records)
+        for name, engine in list(pending.items()):
+            if _solve(engine, module, records) == expected:
+                continue
+
+            def fails(candidate: Records, engine: Engine = engine) -> bool:
+                try:
+                    expected = check.reference(module, candidate)
+                except Exception:
+                    return False  # the reference rejects it, so it is not a valid case to begin with
+                return bool(_solve(engine, module, candidate) != expected)
+
+            minimal = shrink(records, fails)
+            mismatches.append(
+                Mismatch(
+                    check.name, name, minimal, _solve(check.reference, module, minimal), _solve(engine, module, minimal)
+                )
+            )
+            del pending[name]  # one minimal example per engine is enough
+
+    return mismatches
+
+
+def format_mismatch(mismatch: Mismatch) -> str:
+    lines = [f"{mismatch.check}: {mismatch.engine} disagrees on {len(mismatch.records)} record(s)"]
+    lines.extend(f"    {record!r}" for record in mismatch.records)
+    lines.append(f"    expected {mismatch.expected!r}, got {mismatch.actual!r}")
+    return "\n".join(lines)
+
+
+def _make_route(module: ModuleType, size: int, rng: Random) -> Records:
+    return ["".join(rng.choices("()", k=rng.randint(1, 10))) for _ in range(size)]
+
+
+def _walk_route(module: ModuleType, pieces: Records) -> list[int | None]:
+    route = "".join(pieces).encode()
+    floors = [module.find_instruction(route, floor=floor) for floor in range(-3, 4)]
+    return [module.get_destination_floor(route), *floors]
+
+
+def _walk_route_in_blocks(module: ModuleType, pieces: Records) -> list[int | None]:
+    with TemporaryDirectory() as directory:
+        path = Path(directory, "route.data")
+        path.write_text("".join(pieces) + "\n", encoding="ascii")
+        floors = [module.find_instruction_in_blocks(path, floor=floor, block_size=7) for floor in range(-3, 4)]
+        return [module.get_destination_floor_in_blocks(path), *floors]
+
+
+def _walk_route_with_index(module: ModuleType, pieces: Records) -> list[int | None]:
+    index = module.FloorIndex("".join(pieces).encode(), block_size=7)
+    return [index.destination, *(index.find_instruction(floor) for floor in range(-3, 4))]
+
+
+def _make_boxes(module: ModuleType, size: int, rng: Random) -> Records:
+    """Boxes with three sizes, now and then missing one, which every engine must reject."""
+    boxes = [[rng.randint(1, 30), rng.randint(1, 30), rng.randint(1, 30)] for _ in range(size)]
+    return [box[:2] if rng.random() < 0.02 else box for box in boxes]
+
+
+def _wrap_boxes(module: ModuleType, boxes: Records) -> tuple[int, int] | str:
+    try:
+        prisms = [module.Prism.load("x".join(map(str, box))) for box in boxes]
+    except ValueError:
+        return "malformed"
+    return sum(map(module.calculate_paper_for_boxing, prisms)), sum(map(module.calculate_ribbon_size, prisms))
+
+
+def _wrap_box_columns(module: ModuleType, boxes: Records) -> tuple[int, int] | str:
+    with TemporaryDirectory() as directory:
+        path = Path(directory, "boxes.data")
+        path.write_text("".join("x".join(map(str, box)) + "\n" for box in boxes), encoding="ascii")
+        try:
+            totals: tuple[int, int] = module.measure_orders_in_span(path, 0, path.stat().st_size, chunk_size=30)
+        except ValueError:
+            return "malformed"
+        return totals
+
+
+def _make_santa_route(module: ModuleType, size: int, rng: Random) -> Records:
+    return rng.choices("^v<>", k=size)
+
+
+def _visit_houses(module: ModuleType, arrows: Records) -> list[int]:
+    return [len(module.get_unique_houses("".join(arrows).encode(), santas)) for santas in (1, 2, 3)]
+
+
+def _visit_packed_houses(module: ModuleType, arrows: Records) -> list[int]:
+    route = "".join(arrows).encode()
+    return [module.count_unique_houses(route, santas, chunk_size=5) for santas in (1, 2, 3)]
+
+
+def _visit_strided_houses(module: ModuleType, arrows: Records) -> list[int]:
+    route = "".join(arrows).encode()
+    return [coverage.total for coverage in module.sweep_coverage(route, (1, 2, 3), jobs=1)]
+
+
+def _make_secret_key(module: ModuleType, size: int, rng: Random) -> Records:
+    return rng.choices("abcdefghijklmnopqrstuvwxyz", k=size)
+
+
+def _mine_coins(module: ModuleType, letters: Records) -> list[int]:
+    return [module.mine_coins("".join(letters), zeroes=zeroes) for zeroes in (1, 2, 3)]
+
+
+def _mine_coins_in_parallel(module: ModuleType, letters: Records) -> list[int]:
+    key = "".join(letters)
+    return [module.mine_coins_in_parallel(key, zeroes=zeroes, jobs=2, range_size=37) for zeroes in (1, 2, 3)]
+
+
+def _mine_all_coins(module: ModuleType, letters: Records) -> list[int]:
+    answers = module.mine_all_coins("".join(letters), zeroes=(1, 2, 3))
+    return [answers[zeroes] for zeroes in (1, 2, 3)]
+
+
+def _make_light_instructions(module: ModuleType, size: int, rng: Random) -> Records:
+    instructions = []
+    for _ in range(size):
+        x1, y1 = rng.randrange(module.GRID_WIDTH - 50), rng.randrange(module.GRID_HEIGHT - 50)
+        x2, y2 = x1 + rng.randrange(50), y1 + rng.randrange(50)
+        instructions.append(module.Instruction(x1, y1, x2, y2, rng.choice(list(module.Action))))
+    return instructions
+
+
+def _make_distances(module: ModuleType, size: int, rng: Random) -> Records:
+    cities = [name.capitalize() for name in make_names(size + 1)]
+    return [(a, b, rng.randint(1, 100)) for index, a in enumerate(cities) for b in cities[index + 1 :]]
+
+
+def _make_happiness_changes(module: ModuleType, size: int, rng: Random) -> Records:
+    guests = [name.capitalize() for name in make_names(size)]
+    return [((guest, other), rng.randint(-100, 100)) for guest in guests for other in guests if guest != other]
+
+
+def _make_reindeers(module: ModuleType, size: int, rng: Random) -> Records:
+    return [
+        module.Reindeer(name.capitalize(), rng.randint(1, 30), rng.randint(1, 20), rng.randint(1, 50))
+        for name in make_names(size)
+    ]
+
+
+def _make_fights(module: ModuleType, size: int, rng: Random) -> Records:
+    return [(rng.randint(10, 40), rng.randint(200, 500), rng.randint(10, 40), rng.randint(4, 10), rng.random() < 0.5)]
+
+
+def _fight(solve: Callable[..., int], module: ModuleType, fights: Records) -> int:
+    (hitpoints, mana, boss_hitpoints, boss_damage, hard_mode), *_ = fights
+    player, boss = module.Player(hitpoints, mana), module.Player(boss_hitpoints, 0, boss_damage)
+    return solve(player, boss, module.load_spells(), hard_mode=hard_mode)
+
+
+def _make_forward_program(module: ModuleType, size: int, rng: Random) -> Records:
+    # jumps only go forward, so every program, and every program shrunk from it, terminates
+    lines = []
+    for _ in range(size):
+        register, offset = rng.choice("ab"), rng.randint(1, 4)
+        match rng.choice(["hlf", "tpl", "inc", "inc", "jmp", "jie", "jio"]):
+            case "jmp":
+                lines.append(f"jmp +{offset}")
+            case "jie" | "jio" as opcode:
+                lines.append(f"{opcode} {register}, +{offset}")
+            case opcode:
+                lines.append(f"{opcode} {register}")
+    return [module.Instruction.from_str(line) for line in lines]
+
+
+def _run_program(module: ModuleType, instructions: Records) -> tuple[int, int]:
+    computer = module.make_computer(1, 0)
+    module.Program(instructions).execute(computer)
+    return computer["a"], computer["b"]
+
+
+def _run_decoded_program(module: ModuleType, instructions: Records) -> tuple[int, int]:
+    computer = module.make_computer(1, 0)
+    module.execute_decoded(instructions, computer)
+    return computer["a"], computer["b"]
+
+
+def _make_packages(module: ModuleType, size: int, rng: Random) -> Records:
+    weights = [rng.randint(1, 30) for _ in range(size)]
+    weights[-1] += -sum(weights) % 12  # divisible into both three and four groups
+    return weights
+
+
+def _make_cells(module: ModuleType, size: int, rng: Random) -> Records:
+    return [(rng.randint(1, 300), rng.randint(1, 300)) for _ in range(size)]
+
+
+CHECKS: list[CrossCheck] = [
+    CrossCheck(
+        name="find_instruction",
+        day=1,
+        generate=_make_route,
+        reference=_walk_route,
+        engines={"find_instruction_in_blocks": _walk_route_in_blocks, "FloorIndex": _walk_route_with_index},
+        max_size=20,
+    ),
+    CrossCheck(
+        name="calculate_paper_for_boxing",
+        day=2,
+        generate=_make_boxes,
+        reference=_wrap_boxes,
+        engines={"measure_orders_in_span": _wrap_box_columns},
+        max_size=30,
+    ),
+    CrossCheck(
+        name="get_unique_houses",
+        day=3,
+        generate=_make_santa_route,
+        reference=_visit_houses,
+        engines={"count_unique_houses": _visit_packed_houses, "sweep_coverage": _visit_strided_houses},
+        max_size=60,
+    ),
+    CrossCheck(
+        name="mine_coins",
+        day=4,
+        generate=_make_secret_key,
+        reference=_mine_coins,
+        engines={"mine_coins_in_parallel": _mine_coins_in_parallel, "mine_all_coins": _mine_all_coins},
+        max_size=12,
+    ),
+    CrossCheck(
+        name="install_simple_lighting",
+        day=6,
+        generate=_make_light_instructions,
+        reference=lambda m, instructions: m.get_total_brightness(m.install_simple_lighting(instructions)),
+        engines={
+            "count_simple_lighting_by_rows": lambda m, instructions: m.count_simple_lighting_by_rows(instructions)
+        },
+        max_size=20,
+    ),
+    CrossCheck(
+        name="TravelingSalesperson.solve",
+        day=9,
+        generate=_make_distances,
+        reference=lambda m, records: [
+            m.find_shortest_path(m.create_distance_matrix(records))[1],
+            m.find_longest_path(m.create_distance_matrix(records))[1],
+        ],
+        engines={
+            "find_path_with_search": lambda m, records: [
+                m.find_path_with_search(m.create_distance_matrix(records)),
+                m.find_path_with_search(m.create_distance_matrix(records), longest=True),
+            ]
+        },
+        max_size=7,
+    ),
+    CrossCheck(
+        name="find_optimal_arrangement",
+        day=13,
+        generate=_make_happiness_changes,
+        reference=lambda m, changes: m.find_optimal_arrangement(dict(changes)),
+        engines={
+            "find_optimal_arrangement_without_symmetries": (
+                lambda m, changes: m.find_optimal_arrangement_without_symmetries(dict(changes))
+            ),
+            "find_optimal_arrangement_with_search": (
+                lambda m, changes: m.find_optimal_arrangement_with_search(dict(changes))
+            ),
+        },
+        max_size=6,
+    ),
+    CrossCheck(
+        name="calculate_winner_by_scoring_system",
+        day=14,
+        generate=_make_reindeers,
+        reference=lambda m, reindeers: m.calculate_winner_by_scoring_system(reindeers, 500),
+        engines={
+            "calculate_winner_by_scoring_with_distances": (
+                lambda m, reindeers: m.calculate_winner_by_scoring_with_distances(reindeers, 500)
+            )
+        },
+        max_size=8,
+    ),
+    CrossCheck(
+        name="find_least_mana_to_win",
+        day=22,
+        generate=_make_fights,
+        reference=lambda m, fights: _fight(m.find_least_mana_to_win, m, fights),
+        engines={"find_least_mana_with_search": lambda m, fights: _fight(m.find_least_mana_with_search, m, fights)},
+        max_size=1,
+    ),
+    CrossCheck(
+        name="Program.execute",
+        day=23,
+        generate=_make_forward_program,
+        reference=_run_program,
+        engines={"execute_decoded": _run_decoded_program},
+        max_size=40,
+    ),
+    CrossCheck(
+        name="distribute_packages",
+        day=24,
+        generate=_make_packages,
+        reference=lambda m, weights: [
+            m.find_best_quantum_entanglement(tuple(weights), group_count=groups) for groups in (3, 4)
+        ],
+        engines={
+            "find_best_quantum_entanglement_with_search": lambda m, weights: [
+                m.find_best_quantum_entanglement_with_search(tuple(weights), group_count=groups) for groups in (3, 4)
+            ]
+        },
+        max_size=16,
+    ),
+    CrossCheck(
+        name="find_code",
+        day=25,
+        generate=_make_cells,
+        reference=lambda m, cells: [m.find_code(row, col) for row, col in cells],
+        engines={"jump_to_code": lambda m, cells: [m.jump_to_code(row, col) for row, col in cells]},
+        max_size=5,
+    ),
+]
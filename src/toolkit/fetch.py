@@ -0,0 +1,190 @@
+from collections.abc import Iterable
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.client import HTTPConnection
+from http.client import HTTPException
+from http.client import HTTPSConnection
+from http.client import responses
+from os import environ
+from pathlib import Path
+from queue import Empty
+from queue import LifoQueue
+from threading import BoundedSemaphore
+from urllib.parse import urlsplit
+
+from toolkit.cache import write_atomically
+from toolkit.registry import SOURCE_ROOT
+
+DEFAULT_ENDPOINT = "https://adventofcode.com"
+DEFAULT_INPUT_CACHE = SOURCE_ROOT.parent / ".cache" / "inputs"
+DEFAULT_ACCOUNT = "default"
+SESSION_VARIABLE = "AOC_SESSION"
+USER_AGENT = "github.com/stanykey/aoc-2015 input fetcher"
+MAX_CONNECTIONS = 8
+TIMEOUT = 30.0
+
+
+class FetchError(OSError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class Account:
+    name: str
+    session: str
+
+
+@dataclass(frozen=True, slots=True)
+class FetchResult:
+    day: int
+    account: str
+    path: Path
+    cached: bool = False
+    error: str | None = None
+
+
+def load_accounts(path: Path | None = None) -> list[Account]:
+    """
+    Read `name session` pairs, one account per line, or fall back to a single account
+    whose session cookie is taken from the environment.
+    A malformed line raises ValueError naming the file and the line.
+    """
+    if path is None:
+        session = environ.get(SESSION_VARIABLE)
+        return [Account(DEFAULT_ACCOUNT, session)] if session else []
+
+    accounts = []
+    with path.open("r", encoding="utf-8") as file:
+        for number, line in enumerate(file, start=1):
+            if line.strip() and not line.lstrip().startswith("#"):
+                try:
+                    name, session = line.split()
+                except ValueError:
+                    raise ValueError(f"{path}:{number}: expected `name session`, got {line.strip()!r}") from None
+                accounts.append(Account(name, session))
+    return accounts
+
+
+def get_cached_input_path(cache_dir: Path, account: str, day: int) -> Path:
+    return cache_dir / account / f"day_{day:02}.data"
+
+
+class ConnectionPool:
+    """
+    Keep-alive connections to a single host, shared by threads but lent to at most `size` of them at a time,
+    so the concurrency towards the server stays bounded however many requests are queued.
+    """
+
+    def __init__(self, endpoint: str, size: int = MAX_CONNECTIONS, timeout: float = TIMEOUT) -> None:
+        url = urlsplit(endpoint)
+        if url.scheme not in ("http", "https") or not url.netloc:
+            raise ValueError(f"Unsupported endpoint: {endpoint}")
+
+        self.prefix = url.path.rstrip("/")
+        self.host = url.netloc
+        self.secure = url.scheme == "https"
+        self.timeout = timeout
+        self.slots = BoundedSemaphore(size)
+        self.idle: LifoQueue[HTTPConnection] = LifoQueue()
+
+    @contextmanager
+    def connection(self) -> Iterator[HTTPConnection]:
+        """Lend an idle connection (or a new one); a connection that failed is dropped instead of returned."""
+        with self.slots:
+            try:
+                connection = self.idle.get_nowait()
+            except Empty:
+                factory = HTTPSConnection if self.secure else HTTPConnection
+                connection = factory(self.host, timeout=self.timeout)
+
+            try:
+                yield connection
+            except BaseException:
+                connection.close()
+                raise
+            self.idle.put(connection)
+
+    def get(self, path: str, headers: dict[str, str]) -> tuple[int, bytes]:
+        # the server may close an idle keep-alive connection at any time, which only shows on the next request,
+        # so a request failing on a reused connection is retried once on a fresh one
+        for attempt in range(2):
+            with self.connection() as connection:
+                reused = connection.sock is not None
+                try:
+                    connection.request("GET", self.prefix + path, headers=headers)
+                    response = connection.getresponse()
+                    return response.status, response.read()
+                except (HTTPException, ConnectionError):
+                    if attempt or not reused:
+                        raise
+                    connection.close()
+        raise AssertionError("unreachable")
+
+    def close(self) -> None:
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except Empty:
+                return
+
+
+def fetch_input(pool: ConnectionPool, account: Account, day: int) -> bytes:
+    status, body = pool.get(
+        f"/2015/day/{day}/input", {"Cookie": f"session={account.session}", "User-Agent": USER_AGENT}
+    )
+    if status != HTTPStatus.OK:
+        reason = body.decode("utf-8", "replace").strip().splitlines()[:1] or [responses.get(status, "Unknown status")]
+        raise FetchError(f"HTTP {status}: {reason[0]}")
+    return body
+
+
+def fetch_inputs(
+    days: Iterable[int],
+    accounts: Iterable[Account],
+    *,
+    endpoint: str = DEFAULT_ENDPOINT,
+    cache_dir: Path = DEFAULT_INPUT_CACHE,
+    jobs: int = MAX_CONNECTIONS,
+    force: bool = False,
+) -> Iterator[FetchResult]:
+    """
+    Download the input of every day for every account into `<cache_dir>/<account>/day_NN.data`,
+    over at most `jobs` pooled connections, yielding the results in completion order.
+    Inputs already in the cache are kept unless `force` is set; failures are reported, not raised.
+    """
+    days = list(days)
+    pending = []
+    for account in accounts:
+        for day in days:
+            path = get_cached_input_path(cache_dir, account.name, day)
+            if path.exists() and not force:
+                yield FetchResult(day, account.name, path, cached=True)
+            else:
+                pending.append((account, day, path))
+    if not pending:
+        return
+
+    def download(account: Account, day: int, path: Path) -> FetchResult:
+        try:
+            write_atomically(path, fetch_input(pool, account, day))
+        except (OSError, HTTPException) as error:
+            return FetchResult(day, account.name, path, error=str(error) or type(error).__name__)
+        return FetchResult(day, account.name, path)
+
+    pool = ConnectionPool(endpoint, jobs)
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(download, account, day, path) for account, day, path in pending]
+            for future in as_completed(futures):
+                yield future.result()
+    finally:
+        pool.close()
+
+
+def format_fetch_result(result: FetchResult) -> str:
+    status = "cached" if result.cached else "fetched" if result.error is None else f"failed ({result.error})"
+    return f"day {result.day:>2}  {result.account}: {status} {result.path}"
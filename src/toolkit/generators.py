@@ -0,0 +1,283 @@
+from collections.abc import Callable
+from collections.abc import Iterator
+from dataclasses import fields
+from functools import cache
+from json import dump
+from pathlib import Path
+from random import Random
+from re import findall
+from typing import Any
+from typing import TextIO
+
+from toolkit.registry import get_input_path
+from toolkit.registry import load_solution
+from toolkit.registry import make_day_16_aim
+
+CHUNK_SIZE = 1 << 16
+
+type Writer = Callable[[TextIO, int, Random], None]
+
+
+def generate_input(day: int, size: int, path: Path, *, seed: int = 2015) -> None:
+    """Write a valid input of the given scale for a day; the same seed always yields the same file."""
+    try:
+        writer = GENERATORS[day]
+    except KeyError:
+        raise LookupError(f"Day {day} does not read an input file") from None
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as file:
+        writer(file, size, Random(seed))
+
+
+def make_name(index: int) -> str:
+    """Name indexes `a`, `b`, ..., `z`, `aa`, `ab`, ... like spreadsheet columns, but in lowercase."""
+    name = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        name = chr(ord("a") + remainder) + name
+    return name
+
+
+def make_names(count: int) -> Iterator[str]:
+    return map(make_name, range(count))
+
+
+def _write_symbols(file: TextIO, size: int, rng: Random, alphabet: str) -> None:
+    for start in range(0, size, CHUNK_SIZE):
+        file.write("".join(rng.choices(alphabet, k=min(CHUNK_SIZE, size - start))))
+    file.write("\n")
+
+
+def _write_floors(file: TextIO, size: int, rng: Random) -> None:
+    _write_symbols(file, size, rng, "()")
+
+
+def _write_boxes(file: TextIO, size: int, rng: Random) -> None:
+    file.writelines(f"{rng.randint(1, 30)}x{rng.randint(1, 30)}x{rng.randint(1, 30)}\n" for _ in range(size))
+
+
+def _write_route(file: TextIO, size: int, rng: Random) -> None:
+    _write_symbols(file, size, rng, "^v<>")
+
+
+def _write_strings(file: TextIO, size: int, rng: Random) -> None:
+    file.writelines("".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=16)) + "\n" for _ in range(size))
+
+
+def _write_light_instructions(file: TextIO, size: int, rng: Random) -> None:
+    for _ in range(size):
+        action = rng.choice(["turn on", "turn off", "toggle"])
+        x1, x2 = sorted((rng.randrange(1000), rng.randrange(1000)))
+        y1, y2 = sorted((rng.randrange(1000), rng.randrange(1000)))
+        file.write(f"{action} {x1},{y1} through {x2},{y2}\n")
+
+
+def _write_circuit(file: TextIO, size: int, rng: Random) -> None:
+    # a wire only reads wires with greater indexes, so the circuit is acyclic and `a` (index 0) depends on
+    # a random tree whose depth grows logarithmically with the number of wires
+    names = list(make_names(max(size, 2)))
+    leaves = max(1, len(names) // 10)
+
+    def pick(index: int) -> str:
+        return names[rng.randrange(index + 1, len(names))]
+
+    for index, name in enumerate(names):
+        if index >= len(names) - leaves:
+            expression = str(rng.randrange(1 << 16))
+        else:
+            match rng.randrange(6):
+                case 0:
+                    expression = f"{pick(index)} AND {pick(index)}"
+                case 1:
+                    expression = f"1 AND {pick(index)}"
+                case 2:
+                    expression = f"{pick(index)} OR {pick(index)}"
+                case 3:
+                    expression = f"{pick(index)} {rng.choice(['LSHIFT', 'RSHIFT'])} {rng.randint(1, 15)}"
+                case 4:
+                    expression = f"NOT {pick(index)}"
+                case _:
+                    expression = pick(index)
+        file.write(f"{expression} -> {name}\n")
+
+
+def _write_string_literals(file: TextIO, size: int, rng: Random) -> None:
+    pieces = list("abcdefghijklmnopqrstuvwxyz") + ["\\\\", '\\"'] + [f"\\x{code:02x}" for code in range(0x20, 0x7F)]
+    file.writelines('"' + "".join(rng.choices(pieces, k=rng.randint(0, 30))) + '"\n' for _ in range(size))
+
+
+def _write_distances(file: TextIO, size: int, rng: Random) -> None:
+    cities = [f"City{name.capitalize()}" for name in make_names(size)]
+    for i, departure in enumerate(cities):
+        for arrival in cities[i + 1 :]:
+            file.write(f"{departure} to {arrival} = {rng.randint(1, 200)}\n")
+
+
+def _write_json(file: TextIO, size: int, rng: Random) -> None:
+    # every value joins a random earlier container, so the nesting depth grows logarithmically with the size
+    # and neither `json` nor the recursive solvers hit the recursion limit
+    root: list[Any] = []
+    pending: list[list[Any] | dict[str, Any]] = [root]
+    colors = ["red", "green", "blue", "orange", "yellow", "violet"]
+    for _ in range(size):
+        container = pending[rng.randrange(len(pending))]
+        if rng.random() < 0.2:
+            value: Any = rng.choice([[], {}])
+            pending.append(value)
+        else:
+            value = rng.randint(-50, 200) if rng.random() < 0.6 else rng.choice(colors)
+
+        if isinstance(container, list):
+            container.append(value)
+        else:
+            container[make_name(len(container))] = value
+    dump(root, file)
+
+
+def _write_happiness(file: TextIO, size: int, rng: Random) -> None:
+    guests = [name.capitalize() for name in make_names(size)]
+    for guest in guests:
+        for neighbour in guests:
+            if guest != neighbour:
+                change = rng.randint(-100, 100)
+                verb = "gain" if change >= 0 else "lose"
+                file.write(f"{guest} would {verb} {abs(change)} happiness units by sitting next to {neighbour}.\n")
+
+
+def _write_reindeers(file: TextIO, size: int, rng: Random) -> None:
+    for name in make_names(size):
+        file.write(
+            f"{name.capitalize()} can fly {rng.randint(1, 30)} km/s for {rng.randint(1, 20)} seconds, "
+            f"but then must rest for {rng.randint(20, 200)} seconds.\n"
+        )
+
+
+def _write_ingredients(file: TextIO, size: int, rng: Random) -> None:
+    for name in make_names(size):
+        capacity, durability, flavor, texture = (rng.randint(-3, 5) for _ in range(4))
+        file.write(
+            f"{name.capitalize()}: capacity {capacity}, durability {durability}, flavor {flavor}, "
+            f"texture {texture}, calories {rng.randint(1, 9)}\n"
+        )
+
+
+def _write_sue_records(file: TextIO, size: int, rng: Random) -> None:
+    # random Sues practically never fit the ticker tape, so one Sue is planted to fit it under each part's rules
+    # and every other Sue is redrawn until it fits neither
+    module = load_solution(16)
+    aim = make_day_16_aim(module)
+    ranged = {"cats": 1, "trees": 1, "pomeranians": -1, "goldfish": -1}
+    exact = [field.name for field in fields(aim) if field.name != "id" and field.name not in ranged]
+
+    def plant(part_two: bool) -> dict[str, int]:
+        name = rng.choice(list(ranged))
+        value = getattr(aim, name)
+        if part_two:
+            value = value + rng.randint(1, 3) if ranged[name] > 0 else rng.randint(0, value - 1)
+        return {name: value} | {other: getattr(aim, other) for other in rng.sample(exact, 2)}
+
+    count = max(size, 2)
+    planted = dict(zip(rng.sample(range(1, count + 1), 2), [plant(False), plant(True)], strict=True))
+    for sue_id in range(1, count + 1):
+        known = planted.get(sue_id)
+        while known is None:
+            known = {key: rng.randint(0, 10) for key in rng.sample([*ranged, *exact], 3)}
+            sue = module.Sue(sue_id, **known)
+            if module.default_matcher(aim, sue) or module.magic_rules_matcher(aim, sue):
+                known = None
+        file.write(f"Sue {sue_id}: {', '.join(f'{key}: {value}' for key, value in known.items())}\n")
+
+
+def _write_containers(file: TextIO, size: int, rng: Random) -> None:
+    file.writelines(f"{rng.randint(1, 50)}\n" for _ in range(size))
+
+
+def _write_lights_configuration(file: TextIO, size: int, rng: Random) -> None:
+    file.writelines("".join(rng.choices("#.", k=size)) + "\n" for _ in range(size))
+
+
+@cache
+def _load_molecule_grammar() -> tuple[tuple[str, str], ...]:
+    module = load_solution(19)
+    replacements, _ = module.parse_input(get_input_path(19))
+    return tuple(replacements)
+
+
+def _write_molecule(file: TextIO, size: int, rng: Random) -> None:
+    # the molecule is derived from `e` with the puzzle's own grammar, so it can always be fabricated,
+    # although the greedy reduction of `find_fewest_steps` may still run into a dead end on it
+    grammar = _load_molecule_grammar()
+    rules: dict[str, list[list[str]]] = {}
+    for source, target in grammar:
+        rules.setdefault(source, []).append(findall(r"[A-Z][a-z]?|e", target))
+
+    molecule = rng.choice(rules["e"])[:]
+    length = sum(map(len, molecule))
+    while length < size:
+        index = rng.randrange(len(molecule))
+        if options := rules.get(molecule[index]):
+            replacement = rng.choice(options)
+            length += sum(map(len, replacement)) - len(molecule[index])
+            molecule[index : index + 1] = replacement
+
+    file.writelines(f"{source} => {target}\n" for source, target in grammar)
+    file.write("\n")
+    file.write("".join(molecule) + "\n")
+
+
+def _write_presents_target(file: TextIO, size: int, rng: Random) -> None:
+    file.write(f"{size}\n")
+
+
+def _write_assembly(file: TextIO, size: int, rng: Random) -> None:
+    # a straight-line prologue prepares register `a`, then the puzzle's Collatz loop counts steps into `b`;
+    # the prologue keeps `a` moderate, so the program always terminates in reasonable time
+    a = 0
+    for _ in range(size):
+        if a < 2:
+            opcode = "inc"
+        elif a > 1_000_000:
+            opcode = "hlf"
+        else:
+            opcode = rng.choice(["inc", "tpl", "tpl"])
+        a = {"inc": a + 1, "tpl": a * 3, "hlf": a // 2}[opcode]
+        file.write(f"{opcode} a\n")
+
+    file.writelines(f"{line}\n" for line in ["jio a, +8", "inc b", "jie a, +4", "tpl a", "inc a", "jmp +2", "hlf a"])
+    file.write("jmp -7\n")
+
+
+def _write_packages(file: TextIO, size: int, rng: Random) -> None:
+    # twelve buckets of the same weight can be split into either three or four equal groups
+    buckets = [[rng.randint(1, 100) for _ in range(max(1, size // 12))] for _ in range(12)]
+    bucket_weight = max(sum(bucket) for bucket in buckets)
+    for bucket in buckets:
+        bucket[-1] += bucket_weight - sum(bucket)
+
+    weights = sorted(weight for bucket in buckets for weight in bucket)
+    file.writelines(f"{weight}\n" for weight in weights)
+
+
+GENERATORS: dict[int, Writer] = {
+    1: _write_floors,
+    2: _write_boxes,
+    3: _write_route,
+    5: _write_strings,
+    6: _write_light_instructions,
+    7: _write_circuit,
+    8: _write_string_literals,
+    9: _write_distances,
+    12: _write_json,
+    13: _write_happiness,
+    14: _write_reindeers,
+    15: _write_ingredients,
+    16: _write_sue_records,
+    17: _write_containers,
+    18: _write_lights_configuration,
+    19: _write_molecule,
+    20: _write_presents_target,
+    23: _write_assembly,
+    24: _write_packages,
+}
@@ -0,0 +1,189 @@
+import sqlite3
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC
+from datetime import datetime
+from functools import cache
+from hashlib import sha256
+from json import dumps
+from json import loads
+from math import comb
+from os import cpu_count
+from pathlib import Path
+from platform import machine
+from platform import node
+from platform import processor
+from platform import python_implementation
+from platform import python_version
+from statistics import NormalDist
+from subprocess import DEVNULL
+from subprocess import CalledProcessError
+from subprocess import check_output
+
+from toolkit.benchmarks import BenchmarkResult
+from toolkit.registry import SOURCE_ROOT
+
+DEFAULT_HISTORY = SOURCE_ROOT.parent / ".cache" / "benchmarks.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created TEXT NOT NULL,
+    machine TEXT NOT NULL,
+    python TEXT NOT NULL,
+    git_commit TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    knob TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    samples TEXT NOT NULL,
+    PRIMARY KEY (run_id, name, size)
+);
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class Run:
+    id: int
+    created: str
+    machine: str
+    python: str
+    git_commit: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class Comparison:
+    name: str
+    knob: str
+    size: int
+    baseline: float
+    candidate: float
+    p_value: float
+
+    @property
+    def ratio(self) -> float:
+        return self.candidate / self.baseline if self.baseline else float("inf")
+
+
+@cache
+def get_machine_fingerprint() -> str:
+    description = f"{node()}/{machine()}/{processor() or '?'}/{cpu_count()} cpus"
+    return f"{description} #{sha256(description.encode()).hexdigest()[:8]}"
+
+
+def get_python_version() -> str:
+    return f"{python_implementation()} {python_version()}"
+
+
+def get_git_commit() -> str | None:
+    """The checked out commit, marked with `+` when the working tree has uncommitted changes."""
+    try:
+        commit = check_output(["git", "rev-parse", "HEAD"], cwd=SOURCE_ROOT, stderr=DEVNULL, text=True).strip()
+        status = check_output(["git", "status", "--porcelain"], cwd=SOURCE_ROOT, stderr=DEVNULL, text=True)
+    except (OSError, CalledProcessError):
+        return None
+    return f"{commit}+" if status.strip() else commit
+
+
+def mann_whitney_greater(candidate: list[float], baseline: list[float]) -> float:
+    """
+    One-sided Mann-Whitney U test: the probability of seeing samples this much slower by chance alone.
+    Small samples use the exact distribution of U, larger ones its normal approximation.
+    """
+    n, m = len(candidate), len(baseline)
+    u = sum(1.0 if c > b else 0.5 if c == b else 0.0 for c in candidate for b in baseline)
+
+    if n * m > 400:
+        mean, sigma = n * m / 2, (n * m * (n + m + 1) / 12) ** 0.5
+        return 1 - NormalDist(mean, sigma).cdf(u - 0.5)
+
+    # ways[k] counts the rankings of n + m distinct samples whose U equals k
+    ways = [[[1] + [0] * (n * m) for _ in range(m + 1)] for _ in range(n + 1)]
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            for k in range(n * m + 1):
+                ways[i][j][k] = (ways[i - 1][j][k - j] if k >= j else 0) + ways[i][j - 1][k]
+    at_least = sum(ways[n][m][k] for k in range(int(u + 0.5), n * m + 1))
+    return at_least / comb(n + m, n)
+
+
+class BenchmarkHistory:
+    """Benchmark runs kept in SQLite together with where and on what code they were measured."""
+
+    def __init__(self, path: Path = DEFAULT_HISTORY) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def record(self, results: Iterable[BenchmarkResult]) -> int:
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (created, machine, python, git_commit) VALUES (?, ?, ?, ?)",
+                (
+                    datetime.now(UTC).isoformat(timespec="seconds"),
+                    get_machine_fingerprint(),
+                    get_python_version(),
+                    get_git_commit(),
+                ),
+            )
+            run_id = cursor.lastrowid
+            assert run_id is not None
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO results (run_id, name, knob, size, samples) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, result.name, result.knob, result.size, dumps(result.samples)) for result in results],
+            )
+        return run_id
+
+    def list_runs(self) -> list[Run]:
+        rows = self.connection.execute("SELECT id, created, machine, python, git_commit FROM runs ORDER BY id")
+        return [Run(*row) for row in rows]
+
+    def load_results(self, run_id: int) -> dict[tuple[str, int], BenchmarkResult]:
+        rows = self.connection.execute("SELECT name, knob, size, samples FROM results WHERE run_id = ?", (run_id,))
+        return {(name, size): BenchmarkResult(name, knob, size, loads(samples)) for name, knob, size, samples in rows}
+
+    def compare(self, baseline_id: int, candidate_id: int) -> list[Comparison]:
+        """Compare medians of the benchmarks both runs measured, with the p-value of the candidate being slower."""
+        baseline = self.load_results(baseline_id)
+        candidate = self.load_results(candidate_id)
+
+        comparisons = []
+        for key in sorted(baseline.keys() & candidate.keys()):
+            before, after = baseline[key], candidate[key]
+            p_value = mann_whitney_greater(after.samples, before.samples)
+            comparisons.append(Comparison(after.name, after.knob, after.size, before.median, after.median, p_value))
+        return comparisons
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def find_regressions(
+    comparisons: Iterable[Comparison], *, alpha: float = 0.05, threshold: float = 0.05
+) -> list[Comparison]:
+    """Slowdowns that are both statistically significant and larger than the noise threshold."""
+    return [item for item in comparisons if item.p_value < alpha and item.ratio > 1 + threshold]
+
+
+def format_comparisons(comparisons: Iterable[Comparison], regressions: Iterable[Comparison]) -> str:
+    flagged = {(item.name, item.size) for item in regressions}
+    lines = [f"{'benchmark':<45}  {'size':>16}  {'before, s':>10}  {'after, s':>10}  {'change':>8}  {'p':>6}"]
+    for item in comparisons:
+        size = f"{item.knob}={item.size}"
+        mark = "  SLOWER" if (item.name, item.size) in flagged else ""
+        lines.append(
+            f"{item.name:<45}  {size:>16}  {item.baseline:>10.5f}  {item.candidate:>10.5f}  "
+            f"{item.ratio - 1:>+8.1%}  {item.p_value:>6.3f}{mark}"
+        )
+    return "\n".join(lines)
+
+
+def format_runs(runs: Iterable[Run]) -> str:
+    lines = []
+    for run in runs:
+        lines.append(
+            f"#{run.id:<4} {run.created}  {run.git_commit or 'unknown commit':<41}  {run.python}  {run.machine}"
+        )
+    return "\n".join(lines)
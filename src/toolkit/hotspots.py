@@ -0,0 +1,185 @@
+import sys
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from dis import get_instructions
+from math import log
+from pathlib import Path
+from types import CodeType
+from types import ModuleType
+from typing import Any
+
+TOOL_NAME = "aoc-hotspots"
+HEAT_WIDTH = 10
+RETURN = 0  # the "line" a branch goes to when it leaves the function
+UNCONDITIONAL_JUMPS = {"JUMP_FORWARD", "JUMP_BACKWARD", "JUMP_BACKWARD_NO_INTERRUPT"}
+EXITS = {"RETURN_VALUE", "RETURN_CONST", "RAISE_VARARGS", "RERAISE"}
+
+monitoring = sys.monitoring
+
+
+@dataclass(slots=True)
+class Hits:
+    """Executions of every line of a source file and of every direction taken by its conditional branches."""
+
+    path: Path
+    lines: Counter[int] = field(default_factory=Counter)
+    branches: Counter[tuple[int, int]] = field(default_factory=Counter)  # (line of the branch, line it went to)
+
+
+def _line_of(code: CodeType, offset: int) -> int:
+    for start, end, line in code.co_lines():
+        if start <= offset < end and line is not None:
+            return line
+    return code.co_firstlineno
+
+
+def _resolve_branches(code: CodeType) -> dict[tuple[int, int], int | None]:
+    """
+    The line every direction of every conditional jump of the code leads to, following the rest of its own line:
+    a direction that only reaches another test of the same line (the next link of `a < b < c` or of `x and y`)
+    maps to None, as that test decides where the line goes, and a direction that leaves the function to `RETURN`.
+    """
+    instructions = list(get_instructions(code))
+    index = {instruction.offset: position for position, instruction in enumerate(instructions)}
+
+    def follow(line: int, offset: int) -> int | None:
+        position, seen = index[offset], set()
+        while position < len(instructions) and position not in seen:
+            seen.add(position)
+            instruction = instructions[position]
+            target = _line_of(code, instruction.offset)
+            if target != line:
+                return target
+            if instruction.opname in EXITS:
+                return RETURN
+            if instruction.opname in UNCONDITIONAL_JUMPS:
+                position = index[instruction.argval]
+            elif instruction.opname.startswith("POP_JUMP_IF") or instruction.opname == "FOR_ITER":
+                return None
+            else:
+                position += 1
+        return RETURN
+
+    outcomes: dict[tuple[int, int], int | None] = {}
+    for position, instruction in enumerate(instructions):
+        if instruction.opname.startswith("POP_JUMP_IF") or instruction.opname == "FOR_ITER":
+            line = _line_of(code, instruction.offset)
+            for destination in (instructions[position + 1].offset, instruction.argval):
+                outcomes[instruction.offset, destination] = follow(line, destination)
+    return outcomes
+
+
+def _find_code(module: ModuleType) -> list[CodeType]:
+    """The code of every function, method and lambda defined in the module, nested ones included."""
+    filename = module.__file__
+    found: dict[int, CodeType] = {}
+
+    def visit(code: CodeType) -> None:
+        if code.co_filename == filename and id(code) not in found:
+            found[id(code)] = code
+            for constant in code.co_consts:
+                if isinstance(constant, CodeType):
+                    visit(constant)
+
+    def visit_object(value: Any) -> None:
+        match value:
+            case staticmethod() | classmethod():
+                visit_object(value.__func__)
+            case property():
+                for accessor in (value.fget, value.fset, value.fdel):
+                    visit_object(accessor)
+            case _ if isinstance(getattr(value, "__code__", None), CodeType):
+                visit(value.__code__)
+
+    for value in vars(module).values():
+        if isinstance(value, type) and value.__module__ == module.__name__:
+            for member in vars(value).values():
+                visit_object(member)
+        else:
+            visit_object(value)
+    return list(found.values())
+
+
+def _acquire_tool_id() -> int:
+    # cProfile is built on PROFILER_ID in 3.12, so stay clear of it to allow both at once
+    for tool_id in (monitoring.COVERAGE_ID, monitoring.OPTIMIZER_ID):
+        if monitoring.get_tool(tool_id) is None:
+            monitoring.use_tool_id(tool_id, TOOL_NAME)
+            return tool_id
+    raise RuntimeError("No sys.monitoring tool id is free")
+
+
+@contextmanager
+def count_hits(module: ModuleType, *, branches: bool = False) -> Iterator[Hits]:
+    """
+    Count line events, and the directions taken by the conditional jumps if `branches` is set,
+    of the functions defined in a module with `sys.monitoring`.
+    The events are enabled on the code of those functions only, so the rest of the program runs at full speed,
+    but every line they execute is a Python callback, several times the cost of cProfile on line-heavy loops;
+    branch events come on top of the line ones and multiply the cost again by about five, which is why they are opt-in.
+    The counts are filled in when the block exits.
+    """
+    hits = Hits(Path(module.__file__ or module.__name__))
+    code_objects = {id(code): code for code in _find_code(module)}
+    # a plain dict with every line present keeps the callback on the interpreter's fastest subscript paths
+    lines = {line: 0 for code in code_objects.values() for _, _, line in code.co_lines() if line is not None}
+    jumps: Counter[tuple[int, int, int]] = Counter()  # code objects hash their whole contents, so key them by id
+
+    def on_line(code: CodeType, line: int) -> None:
+        lines[line] += 1
+
+    def on_branch(code: CodeType, offset: int, destination: int) -> None:
+        jumps[id(code), offset, destination] += 1
+
+    events = monitoring.events.LINE | (monitoring.events.BRANCH if branches else monitoring.events.NO_EVENTS)
+    tool_id = _acquire_tool_id()
+    try:
+        monitoring.register_callback(tool_id, monitoring.events.LINE, on_line)
+        monitoring.register_callback(tool_id, monitoring.events.BRANCH, on_branch if branches else None)
+        for code in code_objects.values():
+            monitoring.set_local_events(tool_id, code, events)
+        yield hits
+    finally:
+        for code in code_objects.values():
+            monitoring.set_local_events(tool_id, code, monitoring.events.NO_EVENTS)
+        monitoring.register_callback(tool_id, monitoring.events.LINE, None)
+        monitoring.register_callback(tool_id, monitoring.events.BRANCH, None)
+        monitoring.free_tool_id(tool_id)
+
+        hits.lines.update({line: count for line, count in lines.items() if count})
+        outcomes = {code_id: _resolve_branches(code_objects[code_id]) for code_id, _, _ in jumps}
+        for (code_id, offset, destination), count in jumps.items():
+            code = code_objects[code_id]
+            target = outcomes[code_id].get((offset, destination), _line_of(code, destination))
+            if target is not None:
+                hits.branches[_line_of(code, offset), target] += count
+
+
+def format_listing(hits: Hits) -> str:
+    """The source annotated with hit counts, a logarithmic heat bar and the split of every branch."""
+    source = hits.path.read_text(encoding="utf-8").splitlines()
+    hottest = max(hits.lines.values(), default=1)
+    scale = log(hottest + 1)
+
+    outcomes: dict[int, list[tuple[int, int]]] = {}
+    for (line, destination), count in sorted(hits.branches.items()):
+        outcomes.setdefault(line, []).append((destination, count))
+
+    listing = [f"{'hits':>12}  {'heat':<{HEAT_WIDTH}}  {'line':>5}  {hits.path}"]
+    for number, text in enumerate(source, start=1):
+        count = hits.lines.get(number, 0)
+        heat = "#" * round(HEAT_WIDTH * log(count + 1) / scale)
+        row = f"{count or '':>12}  {heat:<{HEAT_WIDTH}}  {number:>5}  {text}"
+        if number in outcomes:
+            split = ", ".join(f"-> {destination or 'return'}: {taken}" for destination, taken in outcomes[number])
+            row = f"{row}    # {split}"
+        listing.append(row)
+    return "\n".join(listing)
+
+
+def save_listing(hits: Hits, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(format_listing(hits) + "\n", encoding="utf-8")
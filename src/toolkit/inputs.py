@@ -0,0 +1,176 @@
+from collections.abc import Callable
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import accumulate
+from itertools import chain
+from itertools import pairwise
+from itertools import repeat
+from mmap import ACCESS_READ
+from mmap import mmap
+from os import cpu_count
+from pathlib import Path
+
+from toolkit.registry import make_worker_pool
+
+CHUNK_SIZE = 1 << 20
+BLOCK_SIZE = 1 << 16
+PARALLEL_THRESHOLD = 1 << 26
+SPANS_PER_WORKER = 4
+
+type Buffer = bytes | mmap
+
+
+def map_input(path: Path) -> Buffer:
+    """
+    Map a whole input file read-only, so it is paged in by the OS on demand instead of being read and decoded.
+    The mapping outlives the file handle and is released once it is garbage collected.
+    """
+    with path.open("rb") as file:
+        if path.stat().st_size == 0:
+            return b""  # empty files cannot be mapped
+        return mmap(file.fileno(), 0, access=ACCESS_READ)
+
+
+def iter_chunks(buffer: Buffer, size: int = CHUNK_SIZE) -> Iterator[memoryview]:
+    """Slice a buffer into views of at most `size` bytes without copying it."""
+    view = memoryview(buffer)
+    for start in range(0, len(view), size):
+        yield view[start : start + size]
+
+
+def count_byte(buffer: Buffer, value: bytes) -> int:
+    """Count occurrences of a single byte chunk by chunk, since `mmap` has no `count` before Python 3.13."""
+    return sum(chunk.tobytes().count(value) for chunk in iter_chunks(buffer))
+
+
+def iter_text(buffer: Buffer, size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Iterate over the characters of an ASCII buffer, decoding only one chunk at a time."""
+    return chain.from_iterable(str(chunk, "ascii") for chunk in iter_chunks(buffer, size))
+
+
+def iter_lines(buffer: Buffer) -> Iterator[bytes]:
+    """Yield the lines of a buffer without their line breaks; only the current line is ever copied."""
+    start, end_of_buffer = 0, len(buffer)
+    while start < end_of_buffer:
+        end = buffer.find(b"\n", start)
+        if end == -1:
+            end = end_of_buffer
+        yield buffer[start:end].rstrip(b"\r")
+        start = end + 1
+
+
+class MappedLines:
+    """A re-iterable sequence of the decoded lines of a buffer that never holds more than one of them."""
+
+    def __init__(self, buffer: Buffer) -> None:
+        self.buffer = buffer
+
+    def __iter__(self) -> Iterator[str]:
+        for line in iter_lines(self.buffer):
+            yield line.decode()
+
+
+def count_symbols_in_span(path: Path, start: int, stop: int, symbols: bytes, block_size: int) -> list[tuple[int, ...]]:
+    """Occurrences of every symbol in each block of a span of a file."""
+    buffer = map_input(path)
+    counts = []
+    for offset in range(start, stop, block_size):
+        block = buffer[offset : min(offset + block_size, stop)]
+        counts.append(tuple(block.count(symbol) for symbol in symbols))
+    return counts
+
+
+def walk_steps_in_span(path: Path, start: int, stop: int, steps: bytes, block_size: int) -> list[tuple[int, int, int]]:
+    """
+    The net change, the lowest and the highest running total of each block of a span of a file,
+    where `steps` translates every byte into a signed byte step; the totals start from 0 at every block.
+    """
+    buffer = map_input(path)
+    walks = []
+    for offset in range(start, stop, block_size):
+        moves = memoryview(buffer[offset : min(offset + block_size, stop)].translate(steps)).cast("b")
+        totals = list(accumulate(moves))
+        walks.append((totals[-1], min(totals), max(totals)))
+    return walks
+
+
+def _map_block_spans[T](
+    path: Path, work: Callable[[Path, int, int], list[T]], block_size: int, jobs: int | None
+) -> list[T]:
+    """
+    Run `work(path, start, stop)` over the whole file, or over spans of whole blocks in worker processes
+    once the file is over `PARALLEL_THRESHOLD` bytes, each mapping the file on its own,
+    so nothing but the per-block results crosses the process boundary.
+    """
+    size = path.stat().st_size
+    workers = jobs or cpu_count() or 1
+    if size < PARALLEL_THRESHOLD or workers == 1:
+        return work(path, 0, size)
+
+    blocks = -(-size // block_size)
+    span = -(-blocks // (workers * SPANS_PER_WORKER)) * block_size
+    starts = range(0, size, span)
+    stops = [min(start + span, size) for start in starts]
+    with ProcessPoolExecutor(workers) as executor:
+        return list(chain.from_iterable(executor.map(work, repeat(path), starts, stops)))
+
+
+def count_symbols_in_blocks(
+    path: Path, symbols: bytes, *, block_size: int = BLOCK_SIZE, jobs: int | None = None
+) -> list[tuple[int, ...]]:
+    """Occurrences of every symbol in each `block_size` block of a file, counted in parallel for big files."""
+    count = partial(count_symbols_in_span, symbols=symbols, block_size=block_size)
+    return _map_block_spans(path, count, block_size, jobs)
+
+
+def walk_steps_in_blocks(
+    path: Path, steps: bytes, *, block_size: int = BLOCK_SIZE, jobs: int | None = None
+) -> list[tuple[int, int, int]]:
+    """Net change, lowest and highest running total of each `block_size` block of a file, walked in parallel."""
+    walk = partial(walk_steps_in_span, steps=steps, block_size=block_size)
+    return _map_block_spans(path, walk, block_size, jobs)
+
+
+def split_lines(buffer: Buffer, parts: int) -> list[tuple[int, int]]:
+    """Cut a buffer into at most `parts` spans of about the same size, each holding whole lines."""
+    bounds = [0]
+    for part in range(1, parts):
+        cut = buffer.find(b"\n", max(bounds[-1], len(buffer) * part // parts))
+        if cut == -1:
+            break
+        bounds.append(cut + 1)
+    bounds.append(len(buffer))
+    return [(start, stop) for start, stop in pairwise(bounds) if start < stop]
+
+
+def iter_line_chunks(
+    buffer: Buffer, start: int = 0, stop: int | None = None, size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Copy a span of a buffer out in chunks of about `size` bytes, cut after line breaks."""
+    stop = len(buffer) if stop is None else stop
+    while start < stop:
+        end = min(start + size, stop)
+        if end < stop:
+            cut = buffer.rfind(b"\n", start, end)
+            if cut == -1:
+                cut = buffer.find(b"\n", end, stop)  # a line longer than a chunk
+            end = stop if cut == -1 else cut + 1
+        yield buffer[start:end]
+        start = end
+
+
+def map_line_spans[T](path: Path, work: Callable[[Path, int, int], T], *, jobs: int | None = None) -> list[T]:
+    """
+    Run `work(path, start, stop)` over spans of whole lines of a file, in worker processes once the file
+    is over `PARALLEL_THRESHOLD` bytes; `work` maps the file by itself, so only its results are pickled.
+    It may live in a day solution: the workers load that solution before running anything.
+    """
+    buffer = map_input(path)
+    workers = jobs or cpu_count() or 1
+    if len(buffer) < PARALLEL_THRESHOLD or workers == 1:
+        return [work(path, 0, len(buffer))]
+
+    spans = split_lines(buffer, workers * SPANS_PER_WORKER)
+    with make_worker_pool(workers, work) as executor:
+        return list(executor.map(work, repeat(path), [start for start, _ in spans], [stop for _, stop in spans]))
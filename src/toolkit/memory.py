@@ -0,0 +1,56 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from sys import platform
+from tracemalloc import get_traced_memory
+from tracemalloc import is_tracing
+from tracemalloc import reset_peak
+from tracemalloc import start
+from tracemalloc import stop
+
+try:
+    from resource import RUSAGE_SELF
+    from resource import getrusage
+except ImportError:  # Windows has no `resource`
+    getrusage = None  # type: ignore[assignment]
+
+MiB = 1 << 20
+
+
+@dataclass(slots=True)
+class MemoryPeak:
+    """
+    `traced` is the highest amount of Python memory allocated on top of what was alive before the block.
+    `rss` is the high-water mark of the whole process at the end of the block (zero if unknown).
+    """
+
+    traced: int = 0
+    rss: int = 0
+
+
+def get_peak_rss() -> int:
+    if getrusage is None:
+        return 0
+
+    peak = getrusage(RUSAGE_SELF).ru_maxrss
+    return peak if platform == "darwin" else peak * 1024  # Linux reports kilobytes, macOS bytes
+
+
+@contextmanager
+def track_peak_memory() -> Iterator[MemoryPeak]:
+    """Measure the peak allocation of a block with tracemalloc; the record is filled in when the block exits."""
+    started_tracing = not is_tracing()
+    if started_tracing:
+        start()
+
+    peak = MemoryPeak()
+    baseline, _ = get_traced_memory()
+    reset_peak()
+    try:
+        yield peak
+    finally:
+        _, traced_peak = get_traced_memory()
+        peak.traced = max(0, traced_peak - baseline)
+        peak.rss = get_peak_rss()
+        if started_tracing:
+            stop()
@@ -0,0 +1,68 @@
+from collections import defaultdict
+from cProfile import Profile
+from pathlib import Path
+from pstats import Stats
+from typing import Any
+
+type Function = tuple[str, int, str]
+
+MAX_DEPTH = 64
+MIN_MICROSECONDS = 1
+
+
+def save_profile(profile: Profile, path: Path) -> None:
+    """Write `<path>.pstats` for `pstats`/snakeviz and `<path>.folded` for flamegraph.pl/speedscope/inferno."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profile.dump_stats(path.with_suffix(".pstats"))
+
+    with path.with_suffix(".folded").open("w", encoding="utf-8") as file:
+        for stack, microseconds in sorted(collapse_stacks(profile).items()):
+            file.write(f"{stack} {microseconds}\n")
+
+
+def collapse_stacks(profile: Profile) -> dict[str, int]:
+    """
+    Rebuild collapsed stacks from the caller graph of a deterministic profile.
+    cProfile keeps only caller -> callee edges, so a function's time is split between its callers
+    in proportion to the cumulative time every caller spent in it (the same estimate gprof2dot/flameprof use).
+    """
+    stats: dict[Function, Any] = Stats(profile).stats  # type: ignore[attr-defined]
+
+    children: dict[Function, list[tuple[Function, float]]] = defaultdict(list)
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, cumulative_time) in callers.items():
+            children[caller].append((function, cumulative_time))
+
+    stacks: dict[str, int] = defaultdict(int)
+
+    def walk(function: Function, path: list[Function], labels: str, share: float) -> None:
+        _, _, own_time, cumulative_time, _ = stats[function]
+        if microseconds := round(own_time * share * 1_000_000):
+            stacks[labels] += microseconds
+
+        if len(path) >= MAX_DEPTH:
+            return
+
+        for child, time_under_caller in children.get(function, []):
+            child_cumulative_time = stats[child][3]
+            if child in path or not child_cumulative_time:
+                continue  # recursion is folded into the outermost frame
+
+            child_share = share * time_under_caller / child_cumulative_time
+            if child_cumulative_time * child_share * 1_000_000 >= MIN_MICROSECONDS:
+                walk(child, path + [child], f"{labels};{_make_label(child)}", child_share)
+
+    for function, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            walk(function, [function], _make_label(function), 1.0)
+
+    return stacks
+
+
+def _make_label(function: Function) -> str:
+    file_name, line, name = function
+    if file_name == "~":
+        label = name  # built-ins have no source location
+    else:
+        label = f"{name} ({Path(file_name).name}:{line})"
+    return label.replace(";", ",")  # semicolons separate frames in the collapsed format
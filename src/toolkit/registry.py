@@ -0,0 +1,331 @@
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import cache
+from importlib.util import module_from_spec
+from importlib.util import spec_from_file_location
+from pathlib import Path
+from sys import modules
+from types import ModuleType
+from typing import Any
+
+from toolkit.memory import MiB
+
+SOURCE_ROOT = Path(__file__).resolve().parent.parent
+INPUT_NAME = "input.data"
+
+type Parser = Callable[[ModuleType, Path], Any]
+type Solver = Callable[[ModuleType, Any], Any]
+
+
+@dataclass(frozen=True, slots=True)
+class Puzzle:
+    """
+    Describes how to drive a day's solution without going through its `main()`.
+    `cost` is a rough wall time in seconds of a whole day, used to schedule the slowest days first.
+    `memory_budget` caps the traced peak allocation in bytes of any single phase on the puzzle input.
+    """
+
+    day: int
+    parse: Parser
+    part_one: Solver
+    part_two: Solver | None = None
+    has_input: bool = True
+    cost: float = 0.0
+    memory_budget: int | None = None
+
+
+def find_solutions(root: Path = SOURCE_ROOT) -> dict[int, Path]:
+    """Map every `day_N` package to its (hyphen-named) solution file."""
+    solutions = {}
+    for package in root.glob("day_*"):
+        _, _, number = package.name.partition("_")
+        if not package.is_dir() or not number.isdigit():
+            continue
+
+        scripts = [path for path in package.glob("*.py") if not path.name.startswith("__")]
+        if len(scripts) != 1:
+            raise LookupError(f"Expected exactly one solution in {package}, found {len(scripts)}")
+        solutions[int(number)] = scripts[0]
+    return dict(sorted(solutions.items()))
+
+
+@cache
+def load_solution(day: int) -> ModuleType:
+    """Import a day's solution module on first use, registering it as `day_N.<name>`."""
+    path = find_solutions()[day]
+    name = f"day_{day}.{path.stem.replace('-', '_')}"
+    spec = spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load {path}")
+
+    module = module_from_spec(spec)
+    modules[name] = module  # dataclasses and pickle look the module up by name
+    spec.loader.exec_module(module)
+    return module
+
+
+def import_solution_module(name: str) -> None:
+    """
+    Load the day solution registered as `name` if it is one; a pool initializer, since workers started
+    by spawn or forkserver know nothing of the modules `load_solution` registered in the parent.
+    """
+    package, _, _ = name.partition(".")
+    number = package.removeprefix("day_")
+    if name not in modules and number.isdigit():
+        load_solution(int(number))
+
+
+def make_worker_pool(workers: int, work: Callable[..., Any]) -> ProcessPoolExecutor:
+    """A process pool whose workers can unpickle `work`, even when it lives in a day solution."""
+    return ProcessPoolExecutor(workers, initializer=import_solution_module, initargs=(work.__module__,))
+
+
+def get_input_path(day: int) -> Path:
+    return find_solutions()[day].parent / INPUT_NAME
+
+
+def get_puzzle(day: int) -> Puzzle:
+    try:
+        return PUZZLES[day]
+    except KeyError:
+        raise LookupError(f"There is no registered puzzle for day {day}") from None
+
+
+def _read_nothing(value: Any) -> Parser:
+    """Parser for days whose input is a constant baked into `main()`."""
+    return lambda module, path: value
+
+
+def _solve_day_7_part_two(module: ModuleType, circuit: dict[str, str]) -> int:
+    overridden = dict(circuit)
+    overridden["b"] = str(module.evaluate("a", circuit, {}))
+    return int(module.evaluate("a", overridden, {}))
+
+
+def make_day_16_aim(module: ModuleType) -> Any:
+    return module.Sue(
+        id=0,
+        children=3,
+        cats=7,
+        samoyeds=2,
+        pomeranians=3,
+        akitas=0,
+        vizslas=0,
+        goldfish=5,
+        trees=3,
+        cars=2,
+        perfumes=1,
+    )
+
+
+_MINED_NONCES: dict[tuple[str, int], int] = {}  # (secret key, zeroes) -> lowest nonce, for this process only
+
+
+def _mine_day_4(module: ModuleType, key: str, zeroes: int) -> int:
+    """
+    A nonce with more zeroes also has fewer, so a difficulty resumes from the highest easier nonce
+    already mined in this process, and part two skips what part one has swept.
+    With nothing easier mined (say part one came from the answer cache), the sweep starts from 0 on its own.
+    """
+    if (key, zeroes) not in _MINED_NONCES:
+        easier = [nonce for (mined, difficulty), nonce in _MINED_NONCES.items() if mined == key and difficulty < zeroes]
+        start = max(easier, default=0)
+        _MINED_NONCES[key, zeroes] = int(module.mine_all_coins(key, zeroes=(zeroes,), start=start)[zeroes])
+    return _MINED_NONCES[key, zeroes]
+
+
+def _make_day_21_boss(module: ModuleType) -> Any:
+    return module.Player.make_player("Boss", hitpoints=103, base_damage=9, base_armor=2)
+
+
+def _fight_day_22_boss(module: ModuleType, *, hard_mode: bool) -> int:
+    player = module.Player(hitpoints=50, mana=500)
+    boss = module.Player(hitpoints=58, mana=0, damage=9)
+    return int(module.find_least_mana_with_search(player, boss, module.load_spells(), hard_mode=hard_mode))
+
+
+def _run_day_23(module: ModuleType, instructions: list[Any], a: int) -> int:
+    computer = module.make_computer(a, 0)
+    module.Program(instructions).execute(computer)
+    return int(computer["b"])
+
+
+PUZZLES: dict[int, Puzzle] = {
+    puzzle.day: puzzle
+    for puzzle in [
+        Puzzle(
+            day=1,
+            parse=lambda m, path: m.read_instructions(path),
+            part_one=lambda m, route: m.get_destination_floor(route),
+            part_two=lambda m, route: m.find_instruction(route, floor=-1),
+        ),
+        Puzzle(
+            day=2,
+            parse=lambda m, path: m.load_prisms(path),
+            part_one=lambda m, prisms: sum(m.calculate_paper_for_boxing(prism) for prism in prisms),
+            part_two=lambda m, prisms: sum(m.calculate_ribbon_size(prism) for prism in prisms),
+        ),
+        Puzzle(
+            day=3,
+            parse=lambda m, path: m.load_route(path),
+            part_one=lambda m, route: m.count_unique_houses(route, 1),
+            part_two=lambda m, route: m.count_unique_houses(route, 2),
+        ),
+        Puzzle(
+            day=4,
+            parse=_read_nothing("yzbqklnj"),
+            part_one=lambda m, key: _mine_day_4(m, key, 5),
+            part_two=lambda m, key: _mine_day_4(m, key, 6),
+            has_input=False,
+            cost=5.0,
+        ),
+        Puzzle(
+            day=5,
+            parse=lambda m, path: m.load_strings(path),
+            part_one=lambda m, strings: sum(1 for string in strings if m.is_nice_string(string)),
+            part_two=lambda m, strings: sum(1 for string in strings if m.is_ridiculous_nice_string(string)),
+        ),
+        Puzzle(
+            day=6,
+            parse=lambda m, path: m.load_instructions(path),
+            part_one=lambda m, instructions: m.get_total_brightness(m.install_simple_lighting(instructions)),
+            part_two=lambda m, instructions: m.get_total_brightness(m.install_lighting_with_brightness(instructions)),
+            cost=9.5,
+            memory_budget=160 * MiB,
+        ),
+        Puzzle(
+            day=7,
+            parse=lambda m, path: m.load_circuit(path),
+            part_one=lambda m, circuit: m.evaluate("a", circuit, {}),
+            part_two=_solve_day_7_part_two,
+        ),
+        Puzzle(
+            day=8,
+            parse=lambda m, path: m.load_string_literals(path),
+            part_one=lambda m, literals: sum(m.calculate_string_memory_delta(literal) for literal in literals),
+            part_two=lambda m, literals: sum(
+                m.calculate_string_encoding_deltas(literals, [m.encode_literal(literal) for literal in literals])
+            ),
+        ),
+        Puzzle(
+            day=9,
+            parse=lambda m, path: m.create_distance_matrix(m.load_distances(path)),
+            part_one=lambda m, matrix: m.find_shortest_path(matrix)[1],
+            part_two=lambda m, matrix: m.find_longest_path(matrix)[1],
+            memory_budget=4 * MiB,
+        ),
+        Puzzle(
+            day=10,
+            parse=_read_nothing("1113222113"),
+            part_one=lambda m, digits: len(m.dictate_number_with_repetition(digits, 40)),
+            part_two=lambda m, digits: len(m.dictate_number_with_repetition(digits, 50)),
+            has_input=False,
+            cost=1.2,
+            memory_budget=128 * MiB,
+        ),
+        Puzzle(
+            day=11,
+            parse=_read_nothing("hepxcrrq"),
+            part_one=lambda m, password: m.update_password(password),
+            part_two=lambda m, password: m.update_password(m.update_password(password)),
+            has_input=False,
+            cost=1.1,
+        ),
+        Puzzle(
+            day=12,
+            parse=lambda m, path: m.load_json(path),
+            part_one=lambda m, document: m.sum_all_numbers(document),
+            part_two=lambda m, document: m.sum_all_numbers_without_red_property(document),
+        ),
+        Puzzle(
+            day=13,
+            parse=lambda m, path: m.parse_input(path),
+            part_one=lambda m, changes: m.find_optimal_arrangement_with_search(changes),
+            part_two=lambda m, changes: m.find_optimal_arrangement_with_search(m.seat_me(changes)),
+        ),
+        Puzzle(
+            day=14,
+            parse=lambda m, path: m.load_reindeer_records(path),
+            part_one=lambda m, reindeers: m.calculate_winner_by_distance(reindeers, 2503),
+            part_two=lambda m, reindeers: m.calculate_winner_by_scoring_system(reindeers, 2503),
+        ),
+        Puzzle(
+            day=15,
+            parse=lambda m, path: m.load_ingredients(path),
+            part_one=lambda m, ingredients: m.find_best_cookie_score(ingredients, 100),
+            part_two=lambda m, ingredients: m.find_best_cookie_score(ingredients, 100, 500),
+            cost=0.6,
+        ),
+        Puzzle(
+            day=16,
+            parse=lambda m, path: m.load_sue_records(path),
+            part_one=lambda m, sues: m.find_matching_sue(make_day_16_aim(m), sues).id,
+            part_two=lambda m, sues: m.find_matching_sue(make_day_16_aim(m), sues, m.magic_rules_matcher).id,
+        ),
+        Puzzle(
+            day=17,
+            parse=lambda m, path: m.load_containers(path),
+            part_one=lambda m, containers: len(m.Refrigerator(capacity=150).find_fitting_combinations(containers)),
+            part_two=lambda m, containers: len(
+                m.find_smallest_combinations(m.Refrigerator(capacity=150).find_fitting_combinations(containers))
+            ),
+            cost=0.7,
+        ),
+        Puzzle(
+            day=18,
+            parse=lambda m, path: m.load_lights_configuration(path),
+            part_one=lambda m, grid: m.run_animation(grid, 100)[0],
+            part_two=lambda m, grid: m.run_animation_with_corners([row[:] for row in grid], 100)[0],
+            cost=1.0,
+        ),
+        Puzzle(
+            day=19,
+            parse=lambda m, path: m.parse_input(path),
+            part_one=lambda m, puzzle: len(m.generate_replacements(*puzzle)),
+            part_two=lambda m, puzzle: m.find_fewest_steps(*puzzle),
+            memory_budget=4 * MiB,
+        ),
+        Puzzle(
+            day=20,
+            parse=lambda m, path: m.read_input(path),
+            part_one=lambda m, target: m.find_lowest_house(target, 10),
+            part_two=lambda m, target: m.find_lowest_house(target, delivery_count=11, max_visits=50),
+            cost=9.0,
+            memory_budget=192 * MiB,
+        ),
+        Puzzle(
+            day=21,
+            parse=_read_nothing(None),
+            part_one=lambda m, _: m.find_minimum_gold_to_win(_make_day_21_boss(m), m.load_shop()),
+            part_two=lambda m, _: m.find_maximum_gold_to_lose(_make_day_21_boss(m), m.load_shop()),
+            has_input=False,
+        ),
+        Puzzle(
+            day=22,
+            parse=_read_nothing(None),
+            part_one=lambda m, _: _fight_day_22_boss(m, hard_mode=False),
+            part_two=lambda m, _: _fight_day_22_boss(m, hard_mode=True),
+            has_input=False,
+        ),
+        Puzzle(
+            day=23,
+            parse=lambda m, path: m.load_assembly(path),
+            part_one=lambda m, instructions: _run_day_23(m, instructions, 0),
+            part_two=lambda m, instructions: _run_day_23(m, instructions, 1),
+        ),
+        Puzzle(
+            day=24,
+            parse=lambda m, path: m.load_packages(path),
+            part_one=lambda m, packages: m.find_best_quantum_entanglement_with_search(packages, group_count=3),
+            part_two=lambda m, packages: m.find_best_quantum_entanglement_with_search(packages, group_count=4),
+        ),
+        Puzzle(
+            day=25,
+            parse=_read_nothing((2981, 3075)),
+            part_one=lambda m, cell: m.find_code(*cell),
+            has_input=False,
+            cost=0.6,
+        ),
+    ]
+}
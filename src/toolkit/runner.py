@@ -0,0 +1,463 @@
+from collections import deque
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+from contextlib import ExitStack
+from cProfile import Profile
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+from enum import StrEnum
+from enum import unique
+from functools import partial
+from glob import glob
+from json import dump
+from math import inf
+from multiprocessing import Pipe
+from multiprocessing import Process
+from multiprocessing.connection import Connection
+from multiprocessing.connection import wait
+from os import cpu_count
+from pathlib import Path
+from time import perf_counter
+from time import process_time
+from typing import Any
+
+from toolkit.cache import ResultCache
+from toolkit.cache import parse_with_cache
+from toolkit.hotspots import count_hits
+from toolkit.hotspots import save_listing
+from toolkit.memory import MiB
+from toolkit.memory import track_peak_memory
+from toolkit.profiling import save_profile
+from toolkit.registry import Solver
+from toolkit.registry import get_input_path
+from toolkit.registry import get_puzzle
+from toolkit.registry import load_solution
+from toolkit.telemetry import REPORT_INTERVAL
+from toolkit.telemetry import Progress
+from toolkit.telemetry import SearchStats
+from toolkit.telemetry import collect_searches
+from toolkit.telemetry import format_stats
+from toolkit.telemetry import print_progress
+
+WORKER_REPORT_INTERVAL = 0.1
+
+
+@unique
+class Phase(StrEnum):
+    PARSE = "parse"
+    PART_ONE = "part one"
+    PART_TWO = "part two"
+
+
+@dataclass(frozen=True, slots=True)
+class PhaseResult:
+    phase: Phase
+    wall_time: float
+    cpu_time: float
+    answer: str | None = None
+    peak_memory: int | None = None
+    peak_rss: int | None = None
+    cached: bool = False
+    searches: tuple[SearchStats, ...] = ()
+    timed_out: bool = False
+    error: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class DayReport:
+    day: int
+    phases: list[PhaseResult]
+
+    @property
+    def wall_time(self) -> float:
+        return sum(phase.wall_time for phase in self.phases)
+
+    @property
+    def cpu_time(self) -> float:
+        return sum(phase.cpu_time for phase in self.phases)
+
+    @property
+    def peak_memory(self) -> int | None:
+        peaks = [phase.peak_memory for phase in self.phases if phase.peak_memory is not None]
+        return max(peaks, default=None)
+
+
+@dataclass(frozen=True, slots=True)
+class RunOptions:
+    """
+    Optional instrumentation of a run: `profile_dir` collects a cProfile of every phase,
+    `trace_memory` measures peak allocations, `results` reuses answers computed by earlier runs,
+    `reuse_parsed` loads inputs parsed by earlier runs instead of tokenizing them again
+    and `search_stats` collects the counters of the brute-force searches,
+    passing their progress to `progress` every `progress_interval` seconds and their final counters to `finished`.
+    `heatmap_dir` collects line hit counts of the day's solution as annotated listings,
+    with the split of every branch too if `heatmap_branches` is set.
+    """
+
+    profile_dir: Path | None = None
+    trace_memory: bool = False
+    results: ResultCache | None = None
+    reuse_parsed: bool = False
+    search_stats: bool = False
+    progress: Progress | None = print_progress
+    progress_interval: float = REPORT_INTERVAL
+    finished: Progress | None = None
+    heatmap_dir: Path | None = None
+    heatmap_branches: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class TimeBudget:
+    """Seconds a whole day and any single phase of it may take before its worker process is killed."""
+
+    day: float | None = None
+    part: float | None = None
+
+
+type PhaseListener = Callable[[Phase, PhaseResult | None], None]
+
+
+def run_puzzle(
+    day: int, input_path: Path | None = None, options: RunOptions | None = None, listener: PhaseListener | None = None
+) -> DayReport:
+    """
+    Solve both parts of a day, timing the parsing and each part separately.
+    `listener` is called with None as a phase starts and with the result once it ends.
+    """
+    options = options or RunOptions()
+    puzzle = get_puzzle(day)
+    module = load_solution(day)
+    if input_path is None:
+        input_path = get_input_path(day)
+
+    def run_phase(phase: Phase, call: Callable[[], Any]) -> tuple[Any, PhaseResult]:
+        if listener is not None:
+            listener(phase, None)
+        result, outcome = measure_phase(phase, call)
+        if listener is not None:
+            listener(phase, outcome)
+        return result, outcome
+
+    def measure_phase(phase: Phase, call: Callable[[], Any]) -> tuple[Any, PhaseResult]:
+        profile = Profile() if options.profile_dir is not None else None
+        with ExitStack() as stack:
+            peak = stack.enter_context(track_peak_memory()) if options.trace_memory else None
+            searches = (
+                stack.enter_context(collect_searches(options.progress, options.progress_interval, options.finished))
+                if options.search_stats
+                else []
+            )
+            hits = (
+                stack.enter_context(count_hits(module, branches=options.heatmap_branches))
+                if options.heatmap_dir is not None
+                else None
+            )
+
+            started, cpu_started = perf_counter(), process_time()
+            if profile is not None:
+                profile.enable()  # inside the timed region, so the clocks stay out of the profile
+            try:
+                result = call()
+            finally:
+                if profile is not None:
+                    profile.disable()
+            wall_time, cpu_time = perf_counter() - started, process_time() - cpu_started
+
+        if profile is not None and options.profile_dir is not None:
+            save_profile(profile, options.profile_dir / f"day_{day:02}_{phase.name.lower()}")
+        if hits is not None and options.heatmap_dir is not None:
+            save_listing(hits, options.heatmap_dir / f"day_{day:02}_{phase.name.lower()}.heat")
+
+        answer = None if phase is Phase.PARSE else str(result)
+        if peak is None:
+            return result, PhaseResult(phase, wall_time, cpu_time, answer, searches=tuple(searches))
+        return result, PhaseResult(phase, wall_time, cpu_time, answer, peak.traced, peak.rss, searches=tuple(searches))
+
+    parts: list[tuple[Phase, Solver]] = []
+    for phase, solve in [(Phase.PART_ONE, puzzle.part_one), (Phase.PART_TWO, puzzle.part_two)]:
+        if solve is not None:
+            parts.append((phase, solve))
+
+    keys: dict[Phase, str] = {}
+    known: dict[Phase, PhaseResult] = {}
+    if options.results is not None:
+        for phase, _ in parts:
+            started = perf_counter()
+            keys[phase] = options.results.make_key(day, phase, input_path if puzzle.has_input else None)
+            if (answer := options.results.load(keys[phase])) is not None:
+                known[phase] = PhaseResult(phase, perf_counter() - started, 0.0, answer, cached=True)
+
+    if len(known) == len(parts):
+        return DayReport(day, list(known.values()))  # nothing is left to solve, so there is no need to parse
+
+    def parse() -> Any:
+        return puzzle.parse(module, input_path)
+
+    if options.reuse_parsed and puzzle.has_input:
+        data, parsing = run_phase(Phase.PARSE, lambda: parse_with_cache(day, input_path, parse))
+    else:
+        data, parsing = run_phase(Phase.PARSE, parse)
+    phases = [parsing]
+
+    for phase, solve in parts:
+        if phase in known:
+            phases.append(known[phase])
+            continue
+
+        _, solving = run_phase(phase, partial(solve, module, data))
+        phases.append(solving)
+        if options.results is not None and solving.answer is not None:
+            options.results.store(keys[phase], solving.answer)
+
+    return DayReport(day, phases)
+
+
+def _solve_in_worker(day: int, input_path: Path | None, options: RunOptions, connection: Connection) -> None:
+    """Stream phase boundaries, search progress and finally the report (or the error) back to the parent."""
+    options = replace(
+        options,
+        search_stats=True,
+        progress=connection.send,
+        progress_interval=WORKER_REPORT_INTERVAL,
+        finished=connection.send,
+    )
+    try:
+        connection.send(run_puzzle(day, input_path, options, lambda phase, result: connection.send((phase, result))))
+    except Exception as error:
+        connection.send(f"{type(error).__name__}: {error}")
+    finally:
+        connection.close()
+
+
+@dataclass(slots=True)
+class _Job:
+    """The parent's view of a day solved by a killable worker process."""
+
+    day: int
+    process: Process
+    connection: Connection
+    started: float = field(default_factory=perf_counter)
+    phase: Phase = Phase.PARSE
+    phase_started: float = field(default_factory=perf_counter)
+    phases: list[PhaseResult] = field(default_factory=list)
+    searches: dict[str, SearchStats] = field(default_factory=dict)
+
+    def get_deadline(self, budget: TimeBudget) -> float:
+        day_deadline = self.started + budget.day if budget.day is not None else inf
+        part_deadline = self.phase_started + budget.part if budget.part is not None else inf
+        return min(day_deadline, part_deadline)
+
+    def receive(self) -> DayReport | None:
+        match self.connection.recv():
+            case DayReport() as report:
+                return report
+            case (Phase() as phase, None):
+                self.phase, self.phase_started = phase, perf_counter()
+                self.searches.clear()
+            case (Phase(), PhaseResult() as result):
+                self.phases.append(result)
+            case SearchStats() as stats:
+                self.searches[stats.name] = stats  # running counters, replaced by the final ones once it ends
+            case str() as error:
+                return self.fail(error)
+        return None
+
+    def time_out(self) -> DayReport:
+        """Kill the worker and report the phases it finished, followed by the one it was stuck in."""
+        self.process.kill()
+        self.process.join()
+        elapsed = perf_counter() - self.phase_started
+        stuck = PhaseResult(self.phase, elapsed, 0.0, searches=tuple(self.searches.values()), timed_out=True)
+        return DayReport(self.day, [*self.phases, stuck])
+
+    def fail(self, error: str) -> DayReport:
+        """Report the phases the worker finished, followed by the one it failed in."""
+        self.process.join()
+        elapsed = perf_counter() - self.phase_started
+        failed = PhaseResult(self.phase, elapsed, 0.0, searches=tuple(self.searches.values()), error=error)
+        return DayReport(self.day, [*self.phases, failed])
+
+
+def run_puzzles_with_budget(
+    days: Iterable[int],
+    budget: TimeBudget,
+    jobs: int | None = None,
+    options: RunOptions | None = None,
+    input_path: Path | None = None,
+) -> list[DayReport]:
+    """
+    Solve every day in its own process, at most `jobs` at a time and the slowest days first.
+    A day over its budget is killed and reported as timed out with the last search statistics it sent,
+    and a day whose worker raises or dies is reported as failed, while the rest of the days keep going.
+    """
+    options = options or RunOptions()
+    pending = deque(sorted(days, key=lambda day: get_puzzle(day).cost, reverse=True))
+    running: dict[Connection, _Job] = {}
+    reports = []
+    try:
+        while pending or running:
+            while pending and len(running) < (jobs or cpu_count() or 1):
+                day = pending.popleft()
+                receiver, sender = Pipe(duplex=False)
+                process = Process(target=_solve_in_worker, args=(day, input_path, options, sender), daemon=True)
+                process.start()
+                sender.close()
+                running[receiver] = _Job(day, process, receiver)
+
+            deadline = min(job.get_deadline(budget) for job in running.values())
+            for connection in wait(list(running), timeout=max(0.0, deadline - perf_counter())):
+                job = running[connection]  # type: ignore[index]
+                try:
+                    report = job.receive()
+                except EOFError:
+                    job.process.join()
+                    report = job.fail(f"the worker died with exit code {job.process.exitcode}")
+                if report is not None:
+                    job.process.join()
+                    reports.append(report)
+                    del running[job.connection]
+
+            now = perf_counter()
+            for connection, job in list(running.items()):
+                if job.get_deadline(budget) <= now:
+                    reports.append(job.time_out())
+                    del running[connection]
+    finally:
+        for job in running.values():
+            job.process.kill()
+
+    return sorted(reports, key=lambda report: report.day)
+
+
+def find_timeouts(reports: Iterable[DayReport]) -> list[str]:
+    return [
+        f"Day {report.day} ran out of time in {phase.phase}"
+        for report in reports
+        for phase in report.phases
+        if phase.timed_out
+    ]
+
+
+def find_failures(reports: Iterable[DayReport]) -> list[str]:
+    return [
+        f"Day {report.day} failed in {phase.phase} with {phase.error}"
+        for report in reports
+        for phase in report.phases
+        if phase.error is not None
+    ]
+
+
+def check_memory_budgets(reports: Iterable[DayReport]) -> list[str]:
+    """Describe every day whose traced peak exceeds the budget declared in the registry."""
+    overruns = []
+    for report in reports:
+        budget = get_puzzle(report.day).memory_budget
+        if budget is not None and report.peak_memory is not None and report.peak_memory > budget:
+            overruns.append(
+                f"Day {report.day} peaked at {report.peak_memory / MiB:.1f} MiB, over its budget of {budget / MiB:.1f} MiB"
+            )
+    return overruns
+
+
+def run_puzzles_in_parallel(
+    days: Iterable[int], jobs: int | None = None, options: RunOptions | None = None
+) -> list[DayReport]:
+    """
+    Solve days in a process pool. The slowest days are submitted first,
+    so the total time tends to the time of the slowest single day.
+    """
+    schedule = sorted(days, key=lambda day: get_puzzle(day).cost, reverse=True)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_puzzle, day, None, options) for day in schedule]
+        reports = [future.result() for future in as_completed(futures)]
+    return sorted(reports, key=lambda report: report.day)
+
+
+def find_inputs(patterns: Iterable[str]) -> list[Path]:
+    """Expand directories to the files directly inside them (skipping hidden ones) and everything else as a glob."""
+    paths: set[Path] = set()
+    for pattern in patterns:
+        if (directory := Path(pattern)).is_dir():
+            paths.update(path for path in directory.iterdir() if path.is_file() and not path.name.startswith("."))
+        else:
+            paths.update(Path(path) for path in glob(pattern, recursive=True) if Path(path).is_file())
+    return sorted(paths)
+
+
+def run_batch(
+    day: int, input_paths: Iterable[Path], jobs: int | None = None, options: RunOptions | None = None
+) -> Iterator[dict[str, Any]]:
+    """
+    Solve a day against many inputs in a process pool, yielding a record per input as soon as it is solved.
+    A failing input yields a record with its error instead of stopping the batch.
+    """
+    if not get_puzzle(day).has_input:
+        raise LookupError(f"Day {day} does not read an input file")
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(run_puzzle, day, path, options): path for path in input_paths}
+        for future in as_completed(futures):
+            record: dict[str, Any] = {"day": day, "input": str(futures[future])}
+            try:
+                report = future.result()
+            except Exception as error:
+                yield record | {"error": f"{type(error).__name__}: {error}"}
+                continue
+
+            answers = {
+                phase.phase.name.lower(): phase.answer for phase in report.phases if phase.phase is not Phase.PARSE
+            }
+            yield record | answers | {"wall_time": report.wall_time, "cpu_time": report.cpu_time}
+
+
+def format_reports(reports: Iterable[DayReport]) -> str:
+    reports = list(reports)
+    with_memory = any(report.peak_memory is not None for report in reports)
+
+    header = f"{'day':>3}  {'phase':<8}  {'wall, s':>10}  {'cpu, s':>10}"
+    if with_memory:
+        header += f"  {'peak, MiB':>10}  {'rss, MiB':>10}"
+    lines = [f"{header}  answer"]
+
+    wall_time = cpu_time = 0.0
+    for report in reports:
+        for phase in report.phases:
+            line = f"{report.day:>3}  {phase.phase:<8}  {phase.wall_time:>10.4f}  {phase.cpu_time:>10.4f}"
+            if with_memory:
+                line += f"  {(phase.peak_memory or 0) / MiB:>10.2f}  {(phase.peak_rss or 0) / MiB:>10.2f}"
+            answer = "" if phase.answer is None else phase.answer
+            if phase.timed_out:
+                answer = "TIMEOUT"
+            elif phase.error is not None:
+                answer = "FAILED"
+            lines.append(f"{line}  {answer} (cached)" if phase.cached else f"{line}  {answer}")
+        wall_time += report.wall_time
+        cpu_time += report.cpu_time
+    lines.append(f"{'':>3}  {'total':<8}  {wall_time:>10.4f}  {cpu_time:>10.4f}")
+    return "\n".join(lines)
+
+
+def format_searches(reports: Iterable[DayReport]) -> str:
+    lines: list[str] = []
+    for report in reports:
+        for phase in report.phases:
+            lines.extend(f"{report.day:>3}  {phase.phase:<8}  {format_stats(stats)}" for stats in phase.searches)
+    return "\n".join(lines)
+
+
+def dump_reports(reports: Iterable[DayReport], path: Path, *, elapsed: float) -> None:
+    document = {
+        "elapsed": elapsed,
+        "days": [
+            asdict(report)
+            | {"wall_time": report.wall_time, "cpu_time": report.cpu_time, "peak_memory": report.peak_memory}
+            for report in reports
+        ],
+    }
+    with path.open("w", encoding="utf-8") as file:
+        dump(document, file, indent=4)
@@ -0,0 +1,138 @@
+from collections.abc import Callable
+from collections.abc import Hashable
+from collections.abc import Iterable
+from dataclasses import dataclass
+from heapq import heappop
+from heapq import heappush
+from itertools import count
+from typing import Any
+from typing import Protocol
+
+from toolkit.telemetry import SearchStats
+from toolkit.telemetry import track_search
+
+
+class Comparable(Protocol):
+    def __lt__(self, other: Any, /) -> bool: ...
+
+
+@dataclass(frozen=True, slots=True)
+class Problem[S, C: Comparable]:
+    """
+    A minimization over the states reachable from `start`.
+    `cost` is what a state has paid so far, and `bound` an optimistic (never too high) estimate of the total cost
+    of any goal reachable from it, which defaults to the cost itself, i.e. no estimate at all.
+    States that share a `key` must have the same futures, so only the cheapest of them is worth expanding;
+    without a key every state is unique.
+    """
+
+    start: S
+    expand: Callable[[S], Iterable[S]]
+    is_goal: Callable[[S], bool]
+    cost: Callable[[S], C]
+    bound: Callable[[S], C] | None = None
+    key: Callable[[S], Hashable] | None = None
+
+
+class _Transpositions[S, C: Comparable]:
+    """The cheapest cost seen for every key; a state no cheaper than that is a transposition and can be dropped."""
+
+    def __init__(self, problem: Problem[S, C]) -> None:
+        self.problem = problem
+        self.best: dict[Hashable, C] = {}
+
+    def is_new_best(self, state: S) -> bool:
+        if self.problem.key is None:
+            return True
+
+        key, cost = self.problem.key(state), self.problem.cost(state)
+        if key in self.best and not cost < self.best[key]:
+            return False
+        self.best[key] = cost
+        return True
+
+    def is_stale(self, state: S) -> bool:
+        """A cheaper state with the same key was found after this one had been queued."""
+        if self.problem.key is None:
+            return False
+        return self.best[self.problem.key(state)] < self.problem.cost(state)
+
+
+def best_first_search[S, C: Comparable](problem: Problem[S, C], name: str = "best-first search") -> S | None:
+    """
+    A* (Dijkstra without a bound): expand states in the order of their bound with a binary heap,
+    so the first goal taken off the heap is an optimal one.
+    """
+    bound = problem.bound or problem.cost
+    transpositions = _Transpositions(problem)
+    tiebreaker = count()  # states themselves never get compared
+
+    with track_search(name) as stats:
+        transpositions.is_new_best(problem.start)
+        heap = [(bound(problem.start), next(tiebreaker), problem.start)]
+        while heap:
+            _, _, state = heappop(heap)
+            if transpositions.is_stale(state):
+                _count_prune(stats)
+                continue
+            if problem.is_goal(state):
+                if stats is not None:
+                    stats.found += 1
+                return state
+
+            if stats is not None:
+                stats.expand()
+            for child in problem.expand(state):
+                if stats is not None:
+                    stats.test()
+                if transpositions.is_new_best(child):
+                    heappush(heap, (bound(child), next(tiebreaker), child))
+                else:
+                    _count_prune(stats)
+    return None
+
+
+def branch_and_bound[S, C: Comparable](problem: Problem[S, C], name: str = "branch and bound") -> S | None:
+    """
+    Depth-first search with an explicit stack that drops every state whose bound cannot beat the best goal so far.
+    It needs far less memory than best-first search and reaches a first goal, which starts the pruning, quickly.
+    Children are explored in the order `expand` yields them, so yielding promising ones first prunes the most.
+    """
+    bound = problem.bound or problem.cost
+    transpositions = _Transpositions(problem)
+    incumbent: S | None = None
+
+    with track_search(name) as stats:
+        transpositions.is_new_best(problem.start)
+        stack = [problem.start]
+        while stack:
+            state = stack.pop()
+            if transpositions.is_stale(state):
+                _count_prune(stats)
+                continue
+            if incumbent is not None and not bound(state) < problem.cost(incumbent):
+                _count_prune(stats)
+                continue
+            if problem.is_goal(state):
+                if stats is not None:
+                    stats.found += 1
+                incumbent = state
+                continue
+
+            if stats is not None:
+                stats.expand()
+            children = []
+            for child in problem.expand(state):
+                if stats is not None:
+                    stats.test()
+                if transpositions.is_new_best(child):
+                    children.append(child)
+                else:
+                    _count_prune(stats)
+            stack.extend(reversed(children))
+    return incumbent
+
+
+def _count_prune(stats: SearchStats | None) -> None:
+    if stats is not None:
+        stats.prune()
@@ -0,0 +1,206 @@
+import asyncio
+from asyncio import StreamReader
+from asyncio import StreamWriter
+from collections.abc import Callable
+from dataclasses import fields
+from dataclasses import replace
+from http import HTTPStatus
+from json import dumps
+from re import fullmatch
+from typing import Any
+from urllib.parse import parse_qsl
+from urllib.parse import urlsplit
+
+from toolkit.registry import get_input_path
+from toolkit.registry import load_solution
+from toolkit.registry import make_day_16_aim
+
+HOST = "127.0.0.1"
+DEFAULT_PORT = 8015
+MAX_CIRCUITS = 64
+MAX_REQUEST_LINE = 8192
+
+type Query = dict[str, str]
+type Document = dict[str, Any] | str
+
+
+class BadQuery(ValueError):
+    pass
+
+
+class PuzzleState:
+    """
+    Inputs parsed once per server together with whatever the queries keep warm:
+    the first arrivals at every floor, the evaluated signals of every distinct circuit
+    and the answers to already asked aims.
+    """
+
+    def __init__(self) -> None:
+        self.day_1 = load_solution(1)
+        self.floors = self.day_1.FloorIndex(self.day_1.read_instructions(get_input_path(1)))
+
+        self.day_7 = load_solution(7)
+        self.circuit: dict[str, str] = self.day_7.load_circuit(get_input_path(7))
+        self.signals: dict[frozenset[tuple[str, str]], dict[str, int]] = {}
+
+        self.day_14 = load_solution(14)
+        self.reindeers: list[Any] = self.day_14.load_reindeer_records(get_input_path(14))
+
+        self.day_16 = load_solution(16)
+        self.sues: list[Any] = self.day_16.load_sue_records(get_input_path(16))
+        self.aim = make_day_16_aim(self.day_16)
+        self.matches: dict[tuple[Any, bool], int | None] = {}
+
+        self.day_25 = load_solution(25)
+        self.inputs: dict[int, str] = {}
+
+    def get_arrivals(self, query: Query) -> dict[str, Any]:
+        """When Santa first reaches `floor`, or every floor between `low` and `high` that he ever reaches."""
+        if "floor" in query:
+            floor = _get_int(query, "floor")
+            return {"floor": floor, "position": self.floors.find_instruction(floor)}
+
+        arrivals = self.floors.find_instructions(_get_int(query, "low"), _get_int(query, "high"))
+        return {"positions": {str(floor): position for floor, position in arrivals.items()}}
+
+    def get_signal(self, query: Query) -> dict[str, Any]:
+        """`wire` names the wire to read, every other parameter overrides the instruction feeding a wire."""
+        wire = query.pop("wire", "a")
+        overrides = frozenset(query.items())
+        circuit = self.circuit | dict(overrides) if overrides else self.circuit
+        if wire not in circuit:
+            raise BadQuery(f"Unknown wire: {wire}")
+
+        if (cache := self.signals.get(overrides)) is None:
+            if len(self.signals) == MAX_CIRCUITS:
+                del self.signals[next(iter(self.signals))]  # forget the oldest circuit
+            cache = self.signals[overrides] = {}
+        try:
+            return {"wire": wire, "signal": self.day_7.evaluate(wire, circuit, cache)}
+        except (KeyError, ValueError, RecursionError) as error:
+            del self.signals[overrides]  # a broken circuit is not worth keeping warm
+            if isinstance(error, KeyError):
+                raise BadQuery(f"Unknown wire: {error.args[0]}") from None
+            raise
+
+    def get_distances(self, query: Query) -> dict[str, Any]:
+        duration = _get_int(query, "duration")
+        distances = {reindeer.name: reindeer.calc_distance(duration) for reindeer in self.reindeers}
+        return {"duration": duration, "distances": distances, "winner": max(distances, key=distances.__getitem__)}
+
+    def find_sue(self, query: Query) -> dict[str, Any]:
+        """Parameters override the compounds of the ticker tape, `rules=magic` switches to the part two matcher."""
+        magic = query.pop("rules", "exact") == "magic"
+        known = {field.name for field in fields(self.aim)} - {"id"}
+        if unknown := query.keys() - known:
+            raise BadQuery(f"Unknown compounds: {', '.join(sorted(unknown))}")
+
+        aim = replace(self.aim, **{name: _get_int(query, name) for name in query})
+        if (aim, magic) not in self.matches:
+            matcher = self.day_16.magic_rules_matcher if magic else self.day_16.default_matcher
+            sue = self.day_16.find_matching_sue(aim, self.sues, matcher)
+            self.matches[aim, magic] = None if sue is None else sue.id
+        return {"sue": self.matches[aim, magic]}
+
+    def get_code(self, query: Query) -> dict[str, Any]:
+        """Jump straight to the code by modular exponentiation instead of replaying the whole sequence."""
+        row, col = _get_int(query, "row"), _get_int(query, "col")
+        if row < 1 or col < 1:
+            raise BadQuery("Rows and columns start at 1")
+        return {"row": row, "col": col, "code": self.day_25.jump_to_code(row, col)}
+
+    def get_input(self, day: int, headers: dict[str, str]) -> tuple[HTTPStatus, Document]:
+        """
+        Stand in for the puzzle input endpoint of the Advent of Code site, which answers with plain text
+        and wants a session cookie, so fetch clients can be exercised against this server.
+        Every account gets the input checked into the repository.
+        """
+        if "session=" not in headers.get("cookie", ""):
+            return HTTPStatus.BAD_REQUEST, "Puzzle inputs differ by user.  Please log in to get your puzzle input."
+        if day not in self.inputs:
+            try:
+                self.inputs[day] = get_input_path(day).read_text(encoding="utf-8")
+            except (KeyError, FileNotFoundError):
+                return HTTPStatus.NOT_FOUND, "404 Not Found"
+        return HTTPStatus.OK, self.inputs[day]
+
+
+def _get_int(query: Query, name: str) -> int:
+    try:
+        return int(query[name])
+    except KeyError:
+        raise BadQuery(f"Missing parameter: {name}") from None
+    except ValueError:
+        raise BadQuery(f"Not an integer: {name}={query[name]}") from None
+
+
+ROUTES: dict[str, Callable[[PuzzleState, Query], dict[str, Any]]] = {
+    "/day/1/arrival": PuzzleState.get_arrivals,
+    "/day/7/signal": PuzzleState.get_signal,
+    "/day/14/distance": PuzzleState.get_distances,
+    "/day/16/sue": PuzzleState.find_sue,
+    "/day/25/code": PuzzleState.get_code,
+}
+
+
+INPUT_PATH = r"/2015/day/(\d+)/input"
+
+
+def answer(state: PuzzleState, method: str, target: str, headers: dict[str, str]) -> tuple[HTTPStatus, Document]:
+    if method != "GET":
+        return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"Unsupported method: {method}"}
+
+    url = urlsplit(target)
+    if match := fullmatch(INPUT_PATH, url.path):
+        return state.get_input(int(match[1]), headers)
+    if (route := ROUTES.get(url.path)) is None:
+        return HTTPStatus.NOT_FOUND, {"error": f"Unknown path: {url.path}", "paths": list(ROUTES)}
+
+    try:
+        return HTTPStatus.OK, route(state, dict(parse_qsl(url.query)))
+    except (BadQuery, KeyError, ValueError, RecursionError) as error:  # queries can describe broken circuits
+        return HTTPStatus.BAD_REQUEST, {"error": str(error)}
+
+
+async def serve_connection(state: PuzzleState, reader: StreamReader, writer: StreamWriter) -> None:
+    """A minimal HTTP/1.1 loop: GET requests only, bodies are ignored, connections are kept alive."""
+    try:
+        while request_line := await reader.readline():
+            if len(request_line) > MAX_REQUEST_LINE:
+                break
+
+            method, target, version = request_line.decode("latin-1").split(maxsplit=2)
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip().lower()
+
+            status, document = answer(state, method, target, headers)
+            if isinstance(document, str):
+                body, content_type = document.encode(), "text/plain"
+            else:
+                body, content_type = dumps(document).encode(), "application/json"
+            keep_alive = headers.get("connection") != "close" and version.strip() == "HTTP/1.1"
+            writer.write(
+                f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                + body
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ValueError, ConnectionError):
+        pass  # a malformed request or a client that went away
+    finally:
+        writer.close()
+
+
+async def run_server(port: int = DEFAULT_PORT) -> None:
+    """Parse the inputs once, then answer queries on the loopback interface until cancelled."""
+    state = PuzzleState()
+    server = await asyncio.start_server(lambda reader, writer: serve_connection(state, reader, writer), HOST, port)
+    print(f"Serving {', '.join([*ROUTES, INPUT_PATH])} on http://{HOST}:{port}", flush=True)
+    async with server:
+        await server.serve_forever()
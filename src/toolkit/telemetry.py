@@ -0,0 +1,117 @@
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from sys import stderr
+from time import perf_counter
+
+TICK_EVERY = 1 << 12
+REPORT_INTERVAL = 1.0
+
+
+@dataclass(slots=True)
+class SearchStats:
+    """
+    Counters of a single search: `expanded` nodes, `tested` candidates, `pruned` branches
+    and `found` solutions (or improvements of the best one).
+    Hot loops bump them through the methods below, which look at the clock only every `TICK_EVERY` events.
+    """
+
+    name: str
+    expanded: int = 0
+    tested: int = 0
+    pruned: int = 0
+    found: int = 0
+    elapsed: float = 0.0
+    started: float = field(default_factory=perf_counter, repr=False)
+    events: int = field(default=0, repr=False)
+    reported: float = field(default_factory=perf_counter, repr=False)
+
+    @property
+    def throughput(self) -> float:
+        """Nodes and candidates per second."""
+        return (self.expanded + self.tested) / self.elapsed if self.elapsed else 0.0
+
+    def expand(self) -> None:
+        self.expanded += 1
+        self._count()
+
+    def test(self) -> None:
+        self.tested += 1
+        self._count()
+
+    def prune(self) -> None:
+        self.pruned += 1
+        self._count()
+
+    def tick(self) -> None:
+        """Refresh the elapsed time and report progress if the last report is older than the interval."""
+        now = perf_counter()
+        self.elapsed = now - self.started
+        if _progress is not None and now - self.reported >= _interval:
+            self.reported = now
+            _progress(self)
+
+    def _count(self) -> None:
+        self.events += 1
+        if not self.events % TICK_EVERY:
+            self.tick()
+
+
+type Progress = Callable[[SearchStats], None]
+
+_collected: list[SearchStats] | None = None
+_progress: Progress | None = None
+_finished: Progress | None = None
+_interval = REPORT_INTERVAL
+
+
+def format_stats(stats: SearchStats) -> str:
+    return (
+        f"{stats.name}: {stats.expanded} expanded, {stats.tested} tested, {stats.pruned} pruned, "
+        f"{stats.found} found in {stats.elapsed:.2f} s ({stats.throughput:,.0f}/s)"
+    )
+
+
+def print_progress(stats: SearchStats) -> None:
+    print(f"... {format_stats(stats)}", file=stderr, flush=True)
+
+
+@contextmanager
+def collect_searches(
+    progress: Progress | None = None, interval: float = REPORT_INTERVAL, finished: Progress | None = None
+) -> Iterator[list[SearchStats]]:
+    """
+    Enable search telemetry for a block; the list is filled with the stats of every search finished inside it.
+    `progress` receives the running stats of a search at most once per `interval` seconds,
+    `finished` the final stats of every search as soon as it ends.
+    """
+    global _collected, _progress, _finished, _interval
+    outer = _collected, _progress, _finished, _interval
+    _collected, _progress, _finished, _interval = [], progress, finished, interval
+    try:
+        yield _collected
+    finally:
+        _collected, _progress, _finished, _interval = outer
+
+
+@contextmanager
+def track_search(name: str) -> Iterator[SearchStats | None]:
+    """
+    Yield the counters of a search, or None when telemetry is off,
+    so a disabled search pays for nothing more than an `is not None` check.
+    """
+    collected = _collected
+    if collected is None:
+        yield None
+        return
+
+    stats = SearchStats(name)
+    try:
+        yield stats
+    finally:
+        stats.elapsed = perf_counter() - stats.started
+        collected.append(stats)
+        if _finished is not None:
+            _finished(stats)